@@ -13,6 +13,7 @@ import logging
 import os
 import sys
 import traceback
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Annotated
@@ -79,6 +80,7 @@ except ImportError as e:
 try:
     from web_search_mcp.utils.auth import load_auth_config
     from web_search_mcp.utils.config import load_config
+    from web_search_mcp.utils.content_extractor import close_default_client
 
     logger.info("Successfully imported utility modules")
 except ImportError as e:
@@ -110,6 +112,17 @@ load_dotenv()
 logger.info("Environment variables loaded")
 
 
+@asynccontextmanager
+async def _server_lifespan(server: "FastMCP"):
+    """Release shared resources when the MCP server shuts down."""
+    try:
+        yield {}
+    finally:
+        # The shared extraction client pools connections on the server's loop
+        await close_default_client()
+        logger.info("Shared HTTP client closed")
+
+
 class WebSearchMCPServer:
     """Web Search MCP Server using FastMCP."""
 
@@ -135,7 +148,7 @@ class WebSearchMCPServer:
         try:
             # Initialize FastMCP Server
             server_name = self.config.get("server", {}).get("name", "web-search-mcp")
-            self.mcp = FastMCP(server_name)
+            self.mcp = FastMCP(server_name, lifespan=_server_lifespan)
             logger.info("FastMCP server created successfully")
         except Exception as e:
             logger.error(f"Failed to create FastMCP server: {e}")
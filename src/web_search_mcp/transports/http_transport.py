@@ -6,15 +6,22 @@ for MCP communication.
 """
 
 import asyncio
-import json
-import uuid
+import inspect
+import itertools
+import secrets
+import sys
+import time
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional, AsyncIterator, Callable, List, Union
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Optional, AsyncIterator, Callable, List, Mapping, Tuple, Union
 from datetime import datetime, timezone
 from enum import Enum
 
 import httpx
+import orjson
 from fastapi import FastAPI, Request, Response, HTTPException
+from fastapi.encoders import jsonable_encoder
 from fastapi.responses import StreamingResponse
 from starlette.middleware.cors import CORSMiddleware
 import uvicorn
@@ -22,6 +29,62 @@ import uvicorn
 from ..utils.logging_config import ContextualLogger
 
 
+def _capabilities() -> Dict[str, Any]:
+    """Build a fresh MCP capabilities dictionary."""
+    return {
+        "capabilities": {
+            "tools": {},
+            "resources": {},
+            "prompts": {},
+            "logging": {}
+        },
+        "protocolVersion": "2024-11-05",
+        "serverInfo": {
+            "name": "web-search-mcp",
+            "version": "1.0.0"
+        }
+    }
+
+
+# Capabilities never change at runtime, so the HTTP body is serialized once
+_CAPABILITIES_BYTES = orjson.dumps(_capabilities())
+
+# SSE frame delimiters, emitted as bytes so StreamingResponse skips encoding
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
+_SSE_KEEPALIVE = _SSE_PREFIX + orjson.dumps({"type": "keepalive"}) + _SSE_SUFFIX
+
+
+if sys.version_info >= (3, 11):
+    async def _queue_get(queue: asyncio.Queue, timeout: float) -> Any:
+        """Get queue item, raising asyncio.TimeoutError after timeout seconds."""
+        async with asyncio.timeout(timeout):
+            return await queue.get()
+else:
+    async def _queue_get(queue: asyncio.Queue, timeout: float) -> Any:
+        """Get queue item, raising asyncio.TimeoutError after timeout seconds."""
+        return await asyncio.wait_for(queue.get(), timeout=timeout)
+
+
+@lru_cache(maxsize=64)
+def _error_frame(message: str) -> bytes:
+    """Build SSE error frame; error messages repeat, so frames are cached."""
+    return _SSE_PREFIX + orjson.dumps({"type": "error", "message": message}) + _SSE_SUFFIX
+
+
+def _json_response(data: Any) -> Response:
+    """
+    Serialize data straight to a JSON response.
+    
+    orjson handles plain JSON types natively; anything else (pydantic models,
+    sets, dataclasses) falls back to FastAPI's jsonable_encoder.
+    """
+    return Response(
+        content=orjson.dumps(data, default=jsonable_encoder, option=orjson.OPT_NON_STR_KEYS),
+        media_type="application/json"
+    )
+
+
 class HTTPTransportType(Enum):
     """HTTP transport type."""
     
@@ -29,7 +92,7 @@ class HTTPTransportType(Enum):
     STREAMABLE = "streamable"
 
 
-@dataclass
+@dataclass(slots=True)
 class HTTPTransportConfig:
     """HTTP transport configuration."""
     
@@ -42,20 +105,31 @@ class HTTPTransportConfig:
     timeout: float = 30.0
     keepalive_timeout: int = 65
     max_connections: int = 100
+    _dict_cache: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set attribute, invalidating the cached dictionary form."""
+        object.__setattr__(self, name, value)
+        if name != "_dict_cache":
+            object.__setattr__(self, "_dict_cache", None)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
-        return {
-            "host": self.host,
-            "port": self.port,
-            "transport_type": self.transport_type.value,
-            "cors_enabled": self.cors_enabled,
-            "cors_origins": self.cors_origins,
-            "max_request_size": self.max_request_size,
-            "timeout": self.timeout,
-            "keepalive_timeout": self.keepalive_timeout,
-            "max_connections": self.max_connections
-        }
+        if self._dict_cache is None:
+            self._dict_cache = {
+                "host": self.host,
+                "port": self.port,
+                "transport_type": self.transport_type.value,
+                "cors_enabled": self.cors_enabled,
+                "cors_origins": self.cors_origins,
+                "max_request_size": self.max_request_size,
+                "timeout": self.timeout,
+                "keepalive_timeout": self.keepalive_timeout,
+                "max_connections": self.max_connections
+            }
+        return dict(self._dict_cache)
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "HTTPTransportConfig":
@@ -90,6 +164,9 @@ class HTTPTransport:
         self.server: Optional[uvicorn.Server] = None
         self.message_handlers: Dict[str, Callable] = {}
         self.active_connections: Dict[str, Any] = {}
+        self._handlers_frozen: Mapping[str, Callable] = MappingProxyType({})
+        self._get_handler: Callable[[str], Optional[Callable]] = self.message_handlers.get
+        self._last_ts: Tuple[int, str] = (0, "")
         
         self._setup_middleware()
         self._setup_routes()
@@ -107,27 +184,27 @@ class HTTPTransport:
     
     def _setup_routes(self):
         """Setup HTTP routes."""
-        @self.app.get("/health")
+        @self.app.get("/health", response_class=Response)
         async def health_check():
             """Health check endpoint."""
-            return {
+            return _json_response({
                 "status": "healthy",
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "timestamp": self._health_timestamp(),
                 "transport_type": self.config.transport_type.value,
                 "active_connections": len(self.active_connections)
-            }
+            })
         
-        @self.app.post("/mcp")
+        @self.app.post("/mcp", response_class=Response)
         async def handle_mcp_request(request: Request):
             """Handle MCP request."""
             return await self._handle_mcp_request(request)
         
-        @self.app.get("/mcp/capabilities")
+        @self.app.get("/mcp/capabilities", response_class=Response)
         async def get_capabilities():
             """Get MCP capabilities."""
-            return await self._get_capabilities()
+            return Response(content=_CAPABILITIES_BYTES, media_type="application/json")
     
-    async def _handle_mcp_request(self, request: Request) -> Dict[str, Any]:
+    async def _handle_mcp_request(self, request: Request) -> Response:
         """
         Handle MCP request.
         
@@ -135,50 +212,67 @@ class HTTPTransport:
             request: FastAPI request
             
         Returns:
-            MCP response
+            MCP response serialized as JSON
         """
         try:
             # Parse request body
-            body = await request.body()
-            if len(body) > self.config.max_request_size:
-                raise HTTPException(status_code=413, detail="Request too large")
-            
-            request_data = json.loads(body.decode())
+            body = await self._read_body(request)
+            try:
+                request_data = orjson.loads(body)
+            except orjson.JSONDecodeError:
+                raise HTTPException(status_code=400, detail="Invalid JSON")
+            if not isinstance(request_data, dict):
+                raise HTTPException(status_code=400, detail="Invalid request")
             
             # Extract method and handle
             method = request_data.get("method")
-            if not method:
+            if not method or not isinstance(method, str):
                 raise HTTPException(status_code=400, detail="Missing method")
             
-            handler = self.message_handlers.get(method)
-            if not handler:
+            handler = self._get_handler(method)
+            if handler is None:
                 raise HTTPException(status_code=404, detail=f"Unknown method: {method}")
             
-            # Call handler
+            # Call handler; serialize here so encoding failures are logged too
             response = await handler(request_data)
-            return response
+            return _json_response(response)
             
-        except json.JSONDecodeError:
-            raise HTTPException(status_code=400, detail="Invalid JSON")
+        except HTTPException:
+            raise
         except Exception as e:
             self.logger.error(f"Error handling MCP request: {str(e)}")
             raise HTTPException(status_code=500, detail="Internal server error")
     
+    def _health_timestamp(self) -> str:
+        """Get current UTC timestamp, formatted at most once per second."""
+        now = int(time.time())
+        ts_i, ts_s = self._last_ts
+        if now != ts_i:
+            ts_s = datetime.fromtimestamp(now, timezone.utc).isoformat()
+            self._last_ts = (now, ts_s)
+        return ts_s
+    
+    async def _read_body(self, request: Request) -> bytearray:
+        """
+        Read request body, failing fast once it exceeds the size limit.
+        
+        Args:
+            request: FastAPI request
+            
+        Returns:
+            Raw request body
+        """
+        max_size = self.config.max_request_size
+        body = bytearray()
+        async for chunk in request.stream():
+            body += chunk
+            if len(body) > max_size:
+                raise HTTPException(status_code=413, detail="Request too large")
+        return body
+    
     async def _get_capabilities(self) -> Dict[str, Any]:
         """Get MCP capabilities."""
-        return {
-            "capabilities": {
-                "tools": {},
-                "resources": {},
-                "prompts": {},
-                "logging": {}
-            },
-            "protocolVersion": "2024-11-05",
-            "serverInfo": {
-                "name": "web-search-mcp",
-                "version": "1.0.0"
-            }
-        }
+        return _capabilities()
     
     def register_handler(self, method: str, handler: Callable):
         """
@@ -189,10 +283,25 @@ class HTTPTransport:
             handler: Handler function
         """
         self.message_handlers[method] = handler
+        # New registrations invalidate any frozen view until the next freeze
+        self._get_handler = self.message_handlers.get
         self.logger.info(f"Registered handler for method: {method}")
     
+    def freeze_handlers(self):
+        """
+        Freeze the registered handlers for hot-path dispatch.
+        
+        Call once registration is complete; later registrations are still
+        honoured but fall back to the mutable handler table.
+        """
+        self._handlers_frozen = MappingProxyType(dict(self.message_handlers))
+        self._get_handler = self._handlers_frozen.get
+    
     async def start(self):
         """Start HTTP transport."""
+        # Handlers are registered before start; dispatch from a frozen table
+        self.freeze_handlers()
+        
         config = uvicorn.Config(
             app=self.app,
             host=self.config.host,
@@ -217,7 +326,7 @@ class HTTPTransport:
     
     def is_running(self) -> bool:
         """Check if transport is running."""
-        return self.server is not None and hasattr(self.server, 'started') and self.server.started
+        return self.server is not None and getattr(self.server, "started", False)
     
     def get_endpoint_url(self) -> str:
         """Get transport endpoint URL."""
@@ -227,19 +336,35 @@ class HTTPTransport:
 class StreamableHTTPTransport(HTTPTransport):
     """Streamable HTTP transport for MCP communication."""
     
+    # Shared by every stream response; Starlette copies them into raw headers
+    _SSE_HEADERS = {
+        "Cache-Control": "no-cache",
+        "Connection": "keep-alive",
+        "X-Accel-Buffering": "no"
+    }
+    
     def __init__(self, config: HTTPTransportConfig):
         """Initialize streamable HTTP transport."""
         config.transport_type = HTTPTransportType.STREAMABLE
         super().__init__(config)
         self.streaming_connections: Dict[str, asyncio.Queue] = {}
+        # Connection IDs are only lookup keys: a random per-transport prefix
+        # keeps them unguessable, a counter keeps them unique and cheap
+        self._conn_prefix = secrets.token_hex(4)
+        self._conn_seq = itertools.count()
         self._setup_streaming_routes()
     
     def _setup_streaming_routes(self):
         """Setup streaming-specific routes."""
-        @self.app.post("/mcp/stream")
+        @self.app.post("/mcp/stream", response_class=Response)
         async def handle_streaming_request(request: Request):
             """Handle streaming MCP request."""
-            return await self._handle_streaming_request(request)
+            return _json_response(await self._handle_streaming_request(request))
+        
+        @self.app.post("/mcp/stream/direct")
+        async def handle_direct_streaming_request(request: Request):
+            """Handle streaming MCP request with an inline stream."""
+            return await self._handle_direct_streaming_request(request)
         
         @self.app.get("/mcp/stream/{connection_id}")
         async def get_stream(connection_id: str):
@@ -257,11 +382,14 @@ class StreamableHTTPTransport(HTTPTransport):
             Streaming response info
         """
         try:
-            body = await request.body()
-            request_data = json.loads(body.decode())
+            body = await self._read_body(request)
+            try:
+                request_data = orjson.loads(body)
+            except orjson.JSONDecodeError:
+                raise HTTPException(status_code=400, detail="Invalid JSON")
             
             # Create connection ID
-            connection_id = str(uuid.uuid4())
+            connection_id = f"{self._conn_prefix}{next(self._conn_seq):x}"
             
             # Create response queue
             response_queue = asyncio.Queue()
@@ -276,6 +404,8 @@ class StreamableHTTPTransport(HTTPTransport):
                 "status": "processing"
             }
             
+        except HTTPException:
+            raise
         except Exception as e:
             self.logger.error(f"Error handling streaming request: {str(e)}")
             raise HTTPException(status_code=500, detail="Internal server error")
@@ -290,71 +420,123 @@ class StreamableHTTPTransport(HTTPTransport):
         Returns:
             Streaming response
         """
-        if connection_id not in self.streaming_connections:
+        response_queue = self.streaming_connections.get(connection_id)
+        if response_queue is None:
             raise HTTPException(status_code=404, detail="Connection not found")
         
-        response_queue = self.streaming_connections[connection_id]
+        return self._stream_response(response_queue, connection_id)
+    
+    async def _handle_direct_streaming_request(self, request: Request) -> StreamingResponse:
+        """
+        Handle streaming MCP request, streaming the response in the same call.
+        
+        Saves the round trip of fetching the stream separately, and the
+        connection never needs an entry in the connection table.
         
+        Args:
+            request: FastAPI request
+            
+        Returns:
+            Streaming response
+        """
+        body = await self._read_body(request)
+        try:
+            request_data = orjson.loads(body)
+        except orjson.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="Invalid JSON")
+        
+        response_queue = asyncio.Queue()
+        task = asyncio.create_task(self._process_streaming_request(request_data, response_queue))
+        
+        return self._stream_response(response_queue, task=task)
+    
+    def _stream_response(
+        self,
+        response_queue: asyncio.Queue,
+        connection_id: Optional[str] = None,
+        task: Optional[asyncio.Task] = None
+    ) -> StreamingResponse:
+        """
+        Build SSE response draining a response queue.
+        
+        Args:
+            response_queue: Response queue
+            connection_id: Connection ID to remove once the stream ends
+            task: Task filling the queue; the stream keeps it referenced and
+                cancels it if the client goes away first
+            
+        Returns:
+            Streaming response
+        """
         async def generate():
             try:
                 while True:
                     try:
                         # Wait for response with timeout
-                        response = await asyncio.wait_for(response_queue.get(), timeout=30.0)
+                        response = await _queue_get(response_queue, 30.0)
                         
                         if response is None:  # End of stream
                             break
                         
-                        yield f"data: {json.dumps(response)}\n\n"
+                        yield _SSE_PREFIX + orjson.dumps(response) + _SSE_SUFFIX
                         
                     except asyncio.TimeoutError:
                         # Send keepalive
-                        yield f"data: {json.dumps({'type': 'keepalive'})}\n\n"
+                        yield _SSE_KEEPALIVE
                         
             except Exception as e:
                 self.logger.error(f"Error in stream generation: {str(e)}")
-                yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+                yield _error_frame(str(e))
             finally:
                 # Cleanup connection
-                if connection_id in self.streaming_connections:
-                    del self.streaming_connections[connection_id]
+                if connection_id is not None:
+                    self.streaming_connections.pop(connection_id, None)
+                if task is not None:
+                    task.cancel()
         
         return StreamingResponse(
             generate(),
-            media_type="text/plain",
-            headers={
-                "Cache-Control": "no-cache",
-                "Connection": "keep-alive",
-                "X-Accel-Buffering": "no"
-            }
+            media_type="text/event-stream",
+            headers=self._SSE_HEADERS
         )
     
     async def _process_streaming_request(self, request_data: Dict[str, Any], response_queue: asyncio.Queue):
         """
         Process streaming request.
         
+        Handlers may be coroutines, producing a single response, or async
+        generators, producing a sequence of updates.
+        
         Args:
             request_data: Request data
             response_queue: Response queue
         """
         try:
             method = request_data.get("method")
-            handler = self.message_handlers.get(method)
+            handler = self._get_handler(method) if isinstance(method, str) else None
             
-            if not handler:
+            if handler is None:
                 await response_queue.put({
                     "type": "error",
                     "message": f"Unknown method: {method}"
                 })
                 return
             
-            # Call handler
-            response = await handler(request_data)
+            # Call handler; async generator handlers stream each chunk as
+            # it is produced instead of waiting for a single response
+            result = handler(request_data)
+            if inspect.isasyncgen(result):
+                async for chunk in result:
+                    await response_queue.put({
+                        "type": "update",
+                        "data": chunk
+                    })
+                return
             
             # Send response
             await response_queue.put({
                 "type": "response",
-                "data": response
+                "data": await result
             })
             
         except Exception as e:
@@ -374,8 +556,8 @@ class StreamableHTTPTransport(HTTPTransport):
             connection_id: Connection ID
             data: Update data
         """
-        if connection_id in self.streaming_connections:
-            response_queue = self.streaming_connections[connection_id]
+        response_queue = self.streaming_connections.get(connection_id)
+        if response_queue is not None:
             await response_queue.put({
                 "type": "update",
                 "data": data
@@ -5,13 +5,16 @@ Provides Server-Sent Events (SSE) transport for legacy MCP communication.
 """
 
 import asyncio
-import json
+import heapq
+import itertools
+import time
 import uuid
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional, AsyncIterator, Callable, List
+from typing import Dict, Any, Optional, AsyncIterator, Callable, List, Tuple, Union
 from datetime import datetime, timezone
 from enum import Enum
 
+import orjson
 from fastapi import FastAPI, Request, Response, HTTPException
 from fastapi.responses import StreamingResponse
 from starlette.middleware.cors import CORSMiddleware
@@ -20,34 +23,131 @@ import uvicorn
 from ..utils.logging_config import ContextualLogger
 
 
+# Queued in place of a payload to end a connection's stream
+_CLOSE = object()
+
+# (epoch second, ISO string) of the last formatted timestamp
+_iso_cache = (0, "")
+
+
+def _iso_now() -> str:
+    """Get current UTC time as ISO string, formatted at most once per second."""
+    global _iso_cache
+    now = int(time.time())
+    if now != _iso_cache[0]:
+        _iso_cache = (now, datetime.fromtimestamp(now, timezone.utc).isoformat())
+    return _iso_cache[1]
+
+
+# Shared by every stream response; Starlette copies it into raw headers
+_SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no"
+}
+
+# Fixed-shape system payloads are filled in directly rather than
+# serialized from a dict; the substituted values never need escaping
+_KEEPALIVE_DATA = b'{"type":"keepalive","timestamp":"%b"}'
+
+# Complete initial frame for a new stream: event id, connection id, timestamp
+_CONNECTED_TEMPLATE = (
+    b'id: %d\nevent: message\n'
+    b'data: {"type":"connected","connection_id":"%b","timestamp":"%b"}\n\n'
+)
+
+# (epoch second, formatted frame) of the last keepalive
+_keepalive_cache = (0, b"")
+
+
+def _keepalive_bytes() -> bytes:
+    """
+    Get formatted keepalive frame, shared by all connections within a second.
+    
+    Keepalives carry no id since clients never need to resume from one.
+    """
+    global _keepalive_cache
+    now = int(time.time())
+    if now != _keepalive_cache[0]:
+        data = _KEEPALIVE_DATA % _iso_now().encode()
+        _keepalive_cache = (now, _frame(data, SSEEvent.KEEPALIVE))
+    return _keepalive_cache[1]
+
+
+def _frame(data: bytes, event: str, event_id: Optional[int] = None) -> bytes:
+    """
+    Format a single-line payload as SSE event bytes.
+    
+    Internal broadcasts use this instead of building an SSEMessage; the
+    payload must not contain newlines, which holds for orjson output.
+    """
+    if event_id is None:
+        return b"event: %b\ndata: %b\n\n" % (event.encode(), data)
+    return b"id: %d\nevent: %b\ndata: %b\n\n" % (event_id, event.encode(), data)
+
+
 @dataclass
 class SSEMessage:
     """Server-Sent Events message."""
     
-    data: str
+    data: Union[str, bytes]
     event: Optional[str] = None
     id: Optional[str] = None
     retry: Optional[int] = None
+    # A message broadcast to many connections is only formatted once
+    _formatted: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _formatted_bytes: Optional[bytes] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    @property
+    def formatted_bytes(self) -> bytes:
+        """Formatted message, UTF-8 encoded for the response stream."""
+        if self._formatted_bytes is None:
+            data = self.data
+            if isinstance(data, str):
+                data = data.encode()
+            header = self._field_lines().encode()
+            if b"\n" not in data:
+                # Serialized payloads go straight through without a decode
+                self._formatted_bytes = b"%bdata: %b\n\n" % (header, data)
+            else:
+                self._formatted_bytes = (
+                    header
+                    + b"".join([b"data: %b\n" % line for line in data.split(b"\n")])
+                    + b"\n"
+                )
+        return self._formatted_bytes
+    
+    def format_into(self, buf: bytearray) -> None:
+        """Append formatted message bytes to a send buffer."""
+        buf += self.formatted_bytes
+    
+    def _field_lines(self) -> str:
+        """Format the id, event and retry lines preceding the data."""
+        id_line = f"id: {self.id}\n" if self.id else ""
+        event_line = f"event: {self.event}\n" if self.event else ""
+        retry_line = f"retry: {self.retry}\n" if self.retry else ""
+        return f"{id_line}{event_line}{retry_line}"
     
     def format(self) -> str:
         """Format message for SSE."""
-        lines = []
+        if self._formatted is not None:
+            return self._formatted
         
-        if self.id:
-            lines.append(f"id: {self.id}")
+        data = self.data.decode() if isinstance(self.data, bytes) else self.data
         
-        if self.event:
-            lines.append(f"event: {self.event}")
-        
-        if self.retry:
-            lines.append(f"retry: {self.retry}")
+        # Serialized JSON never contains raw newlines, so a single data
+        # line is the common case
+        if "\n" not in data:
+            self._formatted = f"{self._field_lines()}data: {data}\n\n"
+            return self._formatted
         
         # Split data into multiple lines if needed
-        for line in self.data.split('\n'):
-            lines.append(f"data: {line}")
-        
-        lines.append("")  # Empty line to end message
-        return "\n".join(lines)
+        lines = [f"data: {line}" for line in data.split("\n")]
+        lines.append("\n")  # Empty line to end message
+        self._formatted = self._field_lines() + "\n".join(lines)
+        return self._formatted
 
 
 @dataclass
@@ -71,6 +171,7 @@ class SSETransportConfig:
     keepalive_interval: float = 30.0
     max_connections: int = 100
     connection_timeout: float = 300.0  # 5 minutes
+    queue_maxsize: int = 1024
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -81,7 +182,8 @@ class SSETransportConfig:
             "cors_origins": self.cors_origins,
             "keepalive_interval": self.keepalive_interval,
             "max_connections": self.max_connections,
-            "connection_timeout": self.connection_timeout
+            "connection_timeout": self.connection_timeout,
+            "queue_maxsize": self.queue_maxsize
         }
     
     @classmethod
@@ -94,51 +196,77 @@ class SSETransportConfig:
             cors_origins=data.get("cors_origins", ["*"]),
             keepalive_interval=data.get("keepalive_interval", 30.0),
             max_connections=data.get("max_connections", 100),
-            connection_timeout=data.get("connection_timeout", 300.0)
+            connection_timeout=data.get("connection_timeout", 300.0),
+            queue_maxsize=data.get("queue_maxsize", 1024)
         )
 
 
 class SSEConnection:
     """SSE connection management."""
     
-    def __init__(self, connection_id: str, client_info: Dict[str, Any]):
+    def __init__(
+        self, connection_id: str, client_info: Dict[str, Any], queue_maxsize: int = 1024
+    ):
         """
         Initialize SSE connection.
         
         Args:
             connection_id: Unique connection ID
             client_info: Client information
+            queue_maxsize: Maximum number of undelivered messages
         """
         self.connection_id = connection_id
         self.client_info = client_info
-        self.created_at = datetime.now(timezone.utc)
-        self.last_activity = self.created_at
-        self.message_queue: asyncio.Queue = asyncio.Queue()
+        # Epoch seconds; formatted only when connections are listed
+        self.created_at = time.time()
+        # Monotonic seconds, so expiry checks are a plain float compare
+        self.last_activity = time.monotonic()
+        self.message_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_maxsize)
         self.is_active = True
+        self.dropped_messages = 0
+        # Reused for every chunk written to this connection
+        self.send_buffer = bytearray()
+    
+    async def send_message(self, message: SSEMessage) -> bool:
+        """
+        Send message to connection.
+        
+        Returns:
+            True if the message was queued
+        """
+        return self.send_bytes(message.formatted_bytes)
     
-    async def send_message(self, message: SSEMessage):
-        """Send message to connection."""
-        if self.is_active:
-            await self.message_queue.put(message)
-            self.last_activity = datetime.now(timezone.utc)
+    def send_bytes(self, payload: bytes) -> bool:
+        """
+        Send pre-formatted SSE event bytes to connection.
+        
+        Never blocks: messages for a client too slow to drain its queue
+        are dropped rather than stalling the sender.
+        
+        Returns:
+            True if the message was queued
+        """
+        if not self.is_active:
+            return False
+        try:
+            self.message_queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            self.dropped_messages += 1
+            return False
+        self.last_activity = time.monotonic()
+        return True
     
     async def close(self):
         """Close connection."""
         self.is_active = False
-        # Send close message
-        close_message = SSEMessage(
-            data=json.dumps({"type": "close"}),
-            event=SSEEvent.CLOSE
-        )
-        await self.message_queue.put(close_message)
+        if self.message_queue.full():
+            # Make room: the close must get through even to a stalled client
+            self.message_queue.get_nowait()
+        self.message_queue.put_nowait(_CLOSE)
     
     def is_expired(self, timeout: float) -> bool:
         """Check if connection is expired."""
-        if not self.is_active:
-            return True
-        
-        elapsed = (datetime.now(timezone.utc) - self.last_activity).total_seconds()
-        return elapsed > timeout
+        return not self.is_active or time.monotonic() - self.last_activity > timeout
 
 
 class SSETransport:
@@ -159,6 +287,11 @@ class SSETransport:
         self.message_handlers: Dict[str, Callable] = {}
         self.keepalive_task: Optional[asyncio.Task] = None
         self.cleanup_task: Optional[asyncio.Task] = None
+        # Event ids only need to be unique within this transport
+        self._next_id = itertools.count(1).__next__
+        # (monotonic deadline, connection id) entries; a connection that saw
+        # activity since its entry was pushed is re-pushed when it surfaces
+        self._expiry_heap: List[Tuple[float, str]] = []
         
         self._setup_middleware()
         self._setup_routes()
@@ -181,7 +314,7 @@ class SSETransport:
             """Health check endpoint."""
             return {
                 "status": "healthy",
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "timestamp": _iso_now(),
                 "transport_type": "sse",
                 "active_connections": len(self.connections)
             }
@@ -216,6 +349,12 @@ class SSETransport:
         Returns:
             SSE streaming response
         """
+        # Registration below happens without an intervening await, so the
+        # dict size is an exact count of accepted connections
+        if len(self.connections) >= self.config.max_connections:
+            self.logger.warning("Rejecting SSE connection: server at capacity")
+            raise HTTPException(status_code=503, detail="Server at capacity")
+        
         # Create connection
         connection_id = str(uuid.uuid4())
         client_info = {
@@ -224,60 +363,59 @@ class SSETransport:
             "query_params": dict(request.query_params)
         }
         
-        connection = SSEConnection(connection_id, client_info)
+        connection = SSEConnection(connection_id, client_info, self.config.queue_maxsize)
         self.connections[connection_id] = connection
+        heapq.heappush(
+            self._expiry_heap,
+            (connection.last_activity + self.config.connection_timeout, connection_id)
+        )
         
         self.logger.info(f"New SSE connection: {connection_id}")
         
         async def generate():
+            message_queue = connection.message_queue
+            send_buffer = connection.send_buffer
             try:
                 # Send initial connection message
-                initial_message = SSEMessage(
-                    data=json.dumps({
-                        "type": "connected",
-                        "connection_id": connection_id,
-                        "timestamp": datetime.now(timezone.utc).isoformat()
-                    }),
-                    event=SSEEvent.MESSAGE,
-                    id=str(uuid.uuid4())
+                yield _CONNECTED_TEMPLATE % (
+                    self._next_id(), connection_id.encode(), _iso_now().encode()
                 )
-                yield initial_message.format()
                 
-                # Stream messages
-                while connection.is_active:
-                    try:
-                        message = await asyncio.wait_for(
-                            connection.message_queue.get(),
-                            timeout=self.config.keepalive_interval
-                        )
-                        
-                        if message.event == SSEEvent.CLOSE:
+                # Stream messages until the close message; anything queued
+                # before it is still delivered. Keepalives arrive through the
+                # queue from _keepalive_loop, so no per-read timeout is needed.
+                while True:
+                    payload = await message_queue.get()
+                    
+                    if payload is _CLOSE:
+                        break
+                    
+                    # Drain anything else already queued into one chunk
+                    send_buffer += payload
+                    closed = False
+                    while not message_queue.empty():
+                        payload = message_queue.get_nowait()
+                        if payload is _CLOSE:
+                            closed = True
                             break
-                        
-                        yield message.format()
-                        
-                    except asyncio.TimeoutError:
-                        # Send keepalive
-                        keepalive_message = SSEMessage(
-                            data=json.dumps({
-                                "type": "keepalive",
-                                "timestamp": datetime.now(timezone.utc).isoformat()
-                            }),
-                            event=SSEEvent.KEEPALIVE,
-                            id=str(uuid.uuid4())
-                        )
-                        yield keepalive_message.format()
+                        send_buffer += payload
+                    
+                    chunk = bytes(send_buffer)
+                    send_buffer.clear()
+                    yield chunk
+                    if closed:
+                        break
                         
             except Exception as e:
                 self.logger.error(f"Error in SSE connection {connection_id}: {str(e)}")
                 error_message = SSEMessage(
-                    data=json.dumps({
+                    data=orjson.dumps({
                         "type": "error",
                         "message": str(e)
                     }),
                     event=SSEEvent.ERROR
                 )
-                yield error_message.format()
+                yield error_message.formatted_bytes
             finally:
                 # Cleanup connection
                 if connection_id in self.connections:
@@ -287,11 +425,7 @@ class SSETransport:
         return StreamingResponse(
             generate(),
             media_type="text/event-stream",
-            headers={
-                "Cache-Control": "no-cache",
-                "Connection": "keep-alive",
-                "X-Accel-Buffering": "no"
-            }
+            headers=_SSE_HEADERS
         )
     
     async def _handle_send_message(self, request: Request) -> Dict[str, Any]:
@@ -306,26 +440,32 @@ class SSETransport:
         """
         try:
             body = await request.body()
-            data = json.loads(body.decode())
+            data = orjson.loads(body)
             
             message_data = data.get("message", {})
             target_connections = data.get("connections", [])
             
             # Create SSE message
             message = SSEMessage(
-                data=json.dumps(message_data),
+                data=orjson.dumps(message_data),
                 event=data.get("event", SSEEvent.MESSAGE),
-                id=str(uuid.uuid4())
+                id=str(self._next_id())
             )
             
-            # Send to target connections or all if none specified
-            if not target_connections:
-                target_connections = list(self.connections.keys())
+            # Send to target connections or all if none specified;
+            # unknown connection ids are skipped
+            if target_connections:
+                get_connection = self.connections.get
+                targets = [
+                    connection for connection in map(get_connection, target_connections)
+                    if connection is not None
+                ]
+            else:
+                targets = self._connection_snapshot()
             
             sent_count = 0
-            for connection_id in target_connections:
-                if connection_id in self.connections:
-                    await self.connections[connection_id].send_message(message)
+            for connection in targets:
+                if await connection.send_message(message):
                     sent_count += 1
             
             return {
@@ -350,7 +490,7 @@ class SSETransport:
         """
         try:
             body = await request.body()
-            request_data = json.loads(body.decode())
+            request_data = orjson.loads(body)
             
             method = request_data.get("method")
             if not method:
@@ -364,18 +504,17 @@ class SSETransport:
             response = await handler(request_data)
             
             # Broadcast response to all connections
-            message = SSEMessage(
-                data=json.dumps({
+            payload = _frame(
+                orjson.dumps({
                     "type": "mcp_response",
                     "method": method,
                     "response": response
                 }),
-                event=SSEEvent.MESSAGE,
-                id=str(uuid.uuid4())
+                SSEEvent.MESSAGE,
+                self._next_id()
             )
             
-            for connection in self.connections.values():
-                await connection.send_message(message)
+            self._fan_out(payload)
             
             return response
             
@@ -386,14 +525,21 @@ class SSETransport:
     async def _list_connections(self) -> Dict[str, Any]:
         """List active connections."""
         connections_info = []
+        # Offset converting monotonic activity times to wall-clock times
+        wall_offset = time.time() - time.monotonic()
         
         for connection_id, connection in self.connections.items():
             connections_info.append({
                 "connection_id": connection_id,
                 "client_info": connection.client_info,
-                "created_at": connection.created_at.isoformat(),
-                "last_activity": connection.last_activity.isoformat(),
-                "is_active": connection.is_active
+                "created_at": datetime.fromtimestamp(
+                    connection.created_at, timezone.utc
+                ).isoformat(),
+                "last_activity": datetime.fromtimestamp(
+                    connection.last_activity + wall_offset, timezone.utc
+                ).isoformat(),
+                "is_active": connection.is_active,
+                "dropped_messages": connection.dropped_messages
             })
         
         return {
@@ -408,18 +554,7 @@ class SSETransport:
                 await asyncio.sleep(self.config.keepalive_interval)
                 
                 # Send keepalive to all connections
-                keepalive_message = SSEMessage(
-                    data=json.dumps({
-                        "type": "keepalive",
-                        "timestamp": datetime.now(timezone.utc).isoformat()
-                    }),
-                    event=SSEEvent.KEEPALIVE,
-                    id=str(uuid.uuid4())
-                )
-                
-                for connection in list(self.connections.values()):
-                    if connection.is_active:
-                        await connection.send_message(keepalive_message)
+                self._fan_out(_keepalive_bytes())
                 
             except Exception as e:
                 self.logger.error(f"Error in keepalive loop: {str(e)}")
@@ -429,21 +564,72 @@ class SSETransport:
         while True:
             try:
                 await asyncio.sleep(60)  # Check every minute
-                
-                expired_connections = []
-                for connection_id, connection in self.connections.items():
-                    if connection.is_expired(self.config.connection_timeout):
-                        expired_connections.append(connection_id)
-                
-                for connection_id in expired_connections:
-                    if connection_id in self.connections:
-                        await self.connections[connection_id].close()
-                        del self.connections[connection_id]
-                        self.logger.info(f"Cleaned up expired connection: {connection_id}")
+                await self._expire_connections()
                 
             except Exception as e:
                 self.logger.error(f"Error in cleanup loop: {str(e)}")
     
+    async def _expire_connections(self) -> int:
+        """
+        Close connections whose deadline has passed.
+        
+        Only heap entries that are due are examined, so a pass costs
+        O(k log n) for k due entries rather than a scan of every connection.
+        
+        Returns:
+            Number of connections closed
+        """
+        heap = self._expiry_heap
+        timeout = self.config.connection_timeout
+        now = time.monotonic()
+        expired = 0
+        
+        while heap and heap[0][0] <= now:
+            _, connection_id = heapq.heappop(heap)
+            connection = self.connections.get(connection_id)
+            if connection is None:
+                continue
+            
+            if connection.is_expired(timeout):
+                await connection.close()
+                self.connections.pop(connection_id, None)
+                expired += 1
+                self.logger.info(f"Cleaned up expired connection: {connection_id}")
+            else:
+                # Active since this entry was pushed; schedule from the
+                # latest activity instead
+                heapq.heappush(heap, (connection.last_activity + timeout, connection_id))
+        
+        return expired
+    
+    def _connection_snapshot(self) -> Tuple[SSEConnection, ...]:
+        """
+        Snapshot current connections for iteration.
+        
+        Connections come and go while a broadcast is suspended at an await,
+        so broadcasts iterate an immutable copy rather than the live dict.
+        """
+        return tuple(self.connections.values())
+    
+    def _fan_out(self, payload: bytes):
+        """
+        Queue formatted event on all active connections.
+        
+        send_bytes never blocks, so a plain loop delivers to every
+        connection without scheduling anything. One failing connection
+        does not abort delivery to the others.
+        
+        Args:
+            payload: Formatted SSE event bytes
+        """
+        for connection in self._connection_snapshot():
+            if not connection.is_active:
+                continue
+            try:
+                connection.send_bytes(payload)
+            except Exception as e:
+                self.logger.error(f"Error sending to SSE connection: {str(e)}")
+    
     def register_handler(self, method: str, handler: Callable):
         """
         Register message handler.
@@ -463,15 +649,17 @@ class SSETransport:
             data: Message data
             event: Event type
         """
-        message = SSEMessage(
-            data=json.dumps(data),
-            event=event,
-            id=str(uuid.uuid4())
-        )
+        await self.broadcast_raw(orjson.dumps(data), event)
+    
+    async def broadcast_raw(self, payload: bytes, event: str = SSEEvent.MESSAGE):
+        """
+        Broadcast an already serialized message to all connections.
         
-        for connection in self.connections.values():
-            if connection.is_active:
-                await connection.send_message(message)
+        Args:
+            payload: JSON-encoded message data without newlines
+            event: Event type
+        """
+        self._fan_out(_frame(payload, event, self._next_id()))
     
     async def send_to_connection(self, connection_id: str, data: Dict[str, Any], event: str = SSEEvent.MESSAGE):
         """
@@ -484,9 +672,9 @@ class SSETransport:
         """
         if connection_id in self.connections:
             message = SSEMessage(
-                data=json.dumps(data),
+                data=orjson.dumps(data),
                 event=event,
-                id=str(uuid.uuid4())
+                id=str(self._next_id())
             )
             await self.connections[connection_id].send_message(message)
     
@@ -496,7 +684,8 @@ class SSETransport:
             app=self.app,
             host=self.config.host,
             port=self.config.port,
-            loop="asyncio",
+            # uvloop when installed (the "speedups" extra), asyncio otherwise
+            loop="auto",
             access_log=False
         )
         
@@ -516,7 +705,7 @@ class SSETransport:
             self.logger.info("Stopping SSE transport")
             
             # Close all connections
-            for connection in list(self.connections.values()):
+            for connection in self._connection_snapshot():
                 await connection.close()
             
             # Cancel background tasks
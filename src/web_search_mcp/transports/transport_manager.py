@@ -7,9 +7,12 @@ a unified interface for MCP communication.
 
 import asyncio
 from enum import Enum
-from typing import Dict, Any, Optional, List, Union, Callable
+from functools import cached_property
+from typing import Dict, Any, Optional, List, Union, Callable, Awaitable, FrozenSet, Tuple
 from dataclasses import dataclass
 
+import orjson
+
 from .http_transport import HTTPTransport, HTTPTransportConfig, create_http_transport
 from .sse_transport import SSETransport, SSETransportConfig, create_default_sse_config
 from ..utils.logging_config import ContextualLogger
@@ -23,6 +26,9 @@ class TransportType(Enum):
     BOTH = "both"
 
 
+_TRANSPORT_BY_VALUE: Dict[str, TransportType] = {t.value: t for t in TransportType}
+
+
 @dataclass
 class TransportManagerConfig:
     """Transport manager configuration."""
@@ -31,6 +37,18 @@ class TransportManagerConfig:
     http_config: Optional[HTTPTransportConfig] = None
     sse_config: Optional[SSETransportConfig] = None
     
+    def __post_init__(self):
+        """Materialize enabled_transports so enabled_set can re-read it."""
+        self.enabled_transports = list(self.enabled_transports)
+    
+    @property
+    def enabled_set(self) -> FrozenSet[TransportType]:
+        """Enabled transport types, with BOTH expanded to HTTP and SSE."""
+        enabled = frozenset(self.enabled_transports)
+        if TransportType.BOTH in enabled:
+            enabled |= {TransportType.HTTP, TransportType.SSE}
+        return enabled
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
         return {
@@ -42,7 +60,12 @@ class TransportManagerConfig:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "TransportManagerConfig":
         """Create from dictionary."""
-        enabled_transports = [TransportType(t) for t in data.get("enabled_transports", ["http"])]
+        try:
+            enabled_transports = [
+                _TRANSPORT_BY_VALUE[t] for t in data.get("enabled_transports", ("http",))
+            ]
+        except KeyError as e:
+            raise ValueError(f"{e.args[0]!r} is not a valid TransportType") from None
         
         http_config = None
         if data.get("http_config"):
@@ -59,6 +82,13 @@ class TransportManagerConfig:
         )
 
 
+# (type, config attribute, transport attribute, constructor, log label)
+_TRANSPORT_SPECS = (
+    (TransportType.HTTP, "http_config", "http_transport", create_http_transport, "HTTP"),
+    (TransportType.SSE, "sse_config", "sse_transport", SSETransport, "SSE"),
+)
+
+
 class TransportManager:
     """Transport manager for MCP server."""
     
@@ -77,23 +107,73 @@ class TransportManager:
         self.message_handlers: Dict[str, Callable] = {}
         
         self._initialize_transports()
+        
+        # Transport capabilities are fixed once initialized, so probe them
+        # here rather than with hasattr on every call
+        self._any_transport = bool(self.http_transport or self.sse_transport)
+        self._http_can_broadcast = hasattr(self.http_transport, 'broadcast_message')
+        self._http_can_stream = hasattr(self.http_transport, 'send_streaming_update')
+        self._http_has_streams = hasattr(self.http_transport, 'get_active_stream_count')
+    
+    @cached_property
+    def _transports_by_type(self) -> Dict[TransportType, Optional[Union[HTTPTransport, SSETransport]]]:
+        """Transport instances keyed by type."""
+        return {
+            TransportType.HTTP: self.http_transport,
+            TransportType.SSE: self.sse_transport
+        }
+    
+    @cached_property
+    def _endpoints(self) -> Dict[str, str]:
+        """Endpoint URLs of the configured transports, from static config."""
+        endpoints = {}
+        if self.http_transport:
+            endpoints["http"] = self.http_transport.get_endpoint_url()
+        if self.sse_transport:
+            endpoints["sse"] = self.sse_transport.get_endpoint_url()
+        return endpoints
+    
+    @cached_property
+    def _http_type_value(self) -> str:
+        """Value of the HTTP transport's type."""
+        return self.http_transport.config.transport_type.value
     
     def _initialize_transports(self):
         """Initialize configured transports."""
-        for transport_type in self.config.enabled_transports:
-            if transport_type == TransportType.HTTP:
-                if self.config.http_config:
-                    self.http_transport = create_http_transport(self.config.http_config)
-                    self.logger.info("HTTP transport initialized")
-                else:
-                    self.logger.warning("HTTP transport enabled but no config provided")
+        enabled = self.config.enabled_set
+        
+        for transport_type, config_attr, transport_attr, create, label in _TRANSPORT_SPECS:
+            if transport_type not in enabled:
+                continue
             
-            elif transport_type == TransportType.SSE:
-                if self.config.sse_config:
-                    self.sse_transport = SSETransport(self.config.sse_config)
-                    self.logger.info("SSE transport initialized")
-                else:
-                    self.logger.warning("SSE transport enabled but no config provided")
+            transport_config = getattr(self.config, config_attr)
+            if transport_config:
+                setattr(self, transport_attr, create(transport_config))
+                self.logger.info(f"{label} transport initialized")
+            else:
+                self.logger.warning(f"{label} transport enabled but no config provided")
+    
+    async def _run_all(self, coros: List[Awaitable[Any]]):
+        """
+        Await per-transport coroutines, isolating their failures.
+        
+        The default configuration runs a single transport, which is awaited
+        directly rather than paying for gather's task and future setup.
+        
+        Args:
+            coros: Coroutines to run, at least one
+        """
+        if len(coros) == 1:
+            try:
+                await coros[0]
+            except Exception as e:
+                self.logger.error(f"Transport operation failed: {str(e)}")
+            return
+        
+        results = await asyncio.gather(*coros, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                self.logger.error(f"Transport operation failed: {str(result)}")
     
     def register_handler(self, method: str, handler: Callable):
         """
@@ -119,15 +199,15 @@ class TransportManager:
         
         if self.http_transport:
             self.logger.info("Starting HTTP transport")
-            tasks.append(asyncio.create_task(self.http_transport.start()))
+            tasks.append(self.http_transport.start())
         
         if self.sse_transport:
             self.logger.info("Starting SSE transport")
-            tasks.append(asyncio.create_task(self.sse_transport.start()))
+            tasks.append(self.sse_transport.start())
         
         if tasks:
             # Start all transports concurrently
-            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._run_all(tasks)
         else:
             self.logger.warning("No transports configured to start")
     
@@ -137,17 +217,20 @@ class TransportManager:
         
         if self.http_transport and self.http_transport.is_running():
             self.logger.info("Stopping HTTP transport")
-            tasks.append(asyncio.create_task(self.http_transport.stop()))
+            tasks.append(self.http_transport.stop())
         
         if self.sse_transport and self.sse_transport.is_running():
             self.logger.info("Stopping SSE transport")
-            tasks.append(asyncio.create_task(self.sse_transport.stop()))
+            tasks.append(self.sse_transport.stop())
         
         if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._run_all(tasks)
     
     def is_running(self) -> bool:
         """Check if any transport is running."""
+        if not self._any_transport:
+            return False
+        
         http_running = bool(self.http_transport and self.http_transport.is_running())
         sse_running = bool(self.sse_transport and self.sse_transport.is_running())
         
@@ -155,30 +238,35 @@ class TransportManager:
     
     def get_status(self) -> Dict[str, Any]:
         """Get transport status."""
-        status = {
-            "enabled_transports": [t.value for t in self.config.enabled_transports],
-            "transports": {}
-        }
+        transports = {}
         
         if self.http_transport:
-            status["transports"]["http"] = {
-                "running": self.http_transport.is_running(),
-                "endpoint": self.http_transport.get_endpoint_url(),
-                "type": self.http_transport.config.transport_type.value
-            }
-            
             # Add streaming info if available
-            if hasattr(self.http_transport, 'get_active_stream_count'):
-                status["transports"]["http"]["active_streams"] = self.http_transport.get_active_stream_count()
+            if self._http_has_streams:
+                transports["http"] = {
+                    "running": self.http_transport.is_running(),
+                    "endpoint": self._endpoints["http"],
+                    "type": self._http_type_value,
+                    "active_streams": self.http_transport.get_active_stream_count()
+                }
+            else:
+                transports["http"] = {
+                    "running": self.http_transport.is_running(),
+                    "endpoint": self._endpoints["http"],
+                    "type": self._http_type_value
+                }
         
         if self.sse_transport:
-            status["transports"]["sse"] = {
+            transports["sse"] = {
                 "running": self.sse_transport.is_running(),
-                "endpoint": self.sse_transport.get_endpoint_url(),
+                "endpoint": self._endpoints["sse"],
                 "active_connections": self.sse_transport.get_connection_count()
             }
         
-        return status
+        return {
+            "enabled_transports": [t.value for t in self.config.enabled_transports],
+            "transports": transports
+        }
     
     async def broadcast_message(self, data: Dict[str, Any], event: str = "message"):
         """
@@ -191,13 +279,14 @@ class TransportManager:
         tasks = []
         
         if self.sse_transport and self.sse_transport.is_running():
-            tasks.append(self.sse_transport.broadcast_message(data, event))
+            # Serialized once here rather than inside each transport
+            tasks.append(self.sse_transport.broadcast_raw(orjson.dumps(data), event))
         
-        if self.http_transport and hasattr(self.http_transport, 'broadcast_message'):
+        if self._http_can_broadcast:
             tasks.append(self.http_transport.broadcast_message(data, event))
         
         if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._run_all(tasks)
     
     async def send_to_connection(self, connection_id: str, data: Dict[str, Any], transport_type: Optional[TransportType] = None):
         """
@@ -208,25 +297,22 @@ class TransportManager:
             data: Message data
             transport_type: Specific transport type (None for all)
         """
+        tasks = []
+        
         if transport_type is None or transport_type == TransportType.SSE:
             if self.sse_transport and self.sse_transport.is_running():
-                await self.sse_transport.send_to_connection(connection_id, data)
+                tasks.append(self.sse_transport.send_to_connection(connection_id, data))
         
         if transport_type is None or transport_type == TransportType.HTTP:
-            if self.http_transport and hasattr(self.http_transport, 'send_streaming_update'):
-                await self.http_transport.send_streaming_update(connection_id, data)
+            if self._http_can_stream:
+                tasks.append(self.http_transport.send_streaming_update(connection_id, data))
+        
+        if tasks:
+            await self._run_all(tasks)
     
     def get_endpoints(self) -> Dict[str, str]:
         """Get all transport endpoints."""
-        endpoints = {}
-        
-        if self.http_transport:
-            endpoints["http"] = self.http_transport.get_endpoint_url()
-        
-        if self.sse_transport:
-            endpoints["sse"] = self.sse_transport.get_endpoint_url()
-        
-        return endpoints
+        return dict(self._endpoints)
     
     def get_transport(self, transport_type: TransportType) -> Optional[Union[HTTPTransport, SSETransport]]:
         """
@@ -238,16 +324,17 @@ class TransportManager:
         Returns:
             Transport instance or None
         """
-        if transport_type == TransportType.HTTP:
-            return self.http_transport
-        elif transport_type == TransportType.SSE:
-            return self.sse_transport
-        
-        return None
+        return self._transports_by_type.get(transport_type)
 
 
 # Factory functions
 
+# Transport type -> (config parser, transport constructor)
+_TRANSPORT_FACTORIES: Dict[TransportType, Tuple[Callable, Callable]] = {
+    TransportType.HTTP: (HTTPTransportConfig.from_dict, create_http_transport),
+    TransportType.SSE: (SSETransportConfig.from_dict, SSETransport)
+}
+
 def create_transport(transport_type: TransportType, config: Dict[str, Any]) -> Union[HTTPTransport, SSETransport]:
     """
     Create transport instance.
@@ -259,14 +346,12 @@ def create_transport(transport_type: TransportType, config: Dict[str, Any]) -> U
     Returns:
         Transport instance
     """
-    if transport_type == TransportType.HTTP:
-        http_config = HTTPTransportConfig.from_dict(config)
-        return create_http_transport(http_config)
-    elif transport_type == TransportType.SSE:
-        sse_config = SSETransportConfig.from_dict(config)
-        return SSETransport(sse_config)
-    else:
+    factory = _TRANSPORT_FACTORIES.get(transport_type)
+    if factory is None:
         raise ValueError(f"Unsupported transport type: {transport_type}")
+    
+    parse_config, create = factory
+    return create(parse_config(config))
 
 
 def get_available_transports() -> List[TransportType]:
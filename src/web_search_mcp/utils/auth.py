@@ -4,38 +4,60 @@ Authentication utilities for Web Search MCP Server
 
 import logging
 import os
-from typing import Dict, Optional
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 
 from dotenv import load_dotenv
 
 logger = logging.getLogger(__name__)
 
+# Common authentication variables
+_AUTH_VARS = (
+    "API_KEY",
+    "SECRET_KEY",
+    "ACCESS_TOKEN",
+    "REFRESH_TOKEN",
+    "CLIENT_ID",
+    "CLIENT_SECRET",
+    "BEARER_TOKEN",
+    "AUTH_USERNAME",
+    "AUTH_PASSWORD",
+)
+
+# Resolved API keys and Authorization headers. Only hits are stored, so a
+# key that appears later (e.g. from .env) is still picked up.
+_api_keys: Dict[str, str] = {}
+_authorization_headers: Dict[Tuple[Optional[str], str], str] = {}
+
 
 def load_auth_config() -> Dict[str, str]:
     """
     Load authentication configuration from environment variables.
 
+    The environment and .env file are read once per process; call
+    clear_auth_cache() after changing them.
+
     Returns:
         Dictionary containing authentication configuration
     """
+    return dict(_read_auth_config())
+
+
+def clear_auth_cache() -> None:
+    """Forget cached auth configuration, API keys and headers."""
+    _read_auth_config.cache_clear()
+    _api_keys.clear()
+    _authorization_headers.clear()
+
+
+@lru_cache(maxsize=1)
+def _read_auth_config() -> Dict[str, str]:
+    """Read authentication variables, loading .env first."""
     load_dotenv()
 
     auth_config = {}
 
-    # Load common authentication variables
-    auth_vars = [
-        "API_KEY",
-        "SECRET_KEY",
-        "ACCESS_TOKEN",
-        "REFRESH_TOKEN",
-        "CLIENT_ID",
-        "CLIENT_SECRET",
-        "BEARER_TOKEN",
-        "AUTH_USERNAME",
-        "AUTH_PASSWORD",
-    ]
-
-    for var in auth_vars:
+    for var in _AUTH_VARS:
         value = os.getenv(var)
         if value:
             auth_config[var.lower()] = value
@@ -60,6 +82,13 @@ def get_api_key(service: str) -> Optional[str]:
     Returns:
         API key if found, None otherwise
     """
+    key = _api_keys.get(service)
+    if key:
+        return key
+
+    # Make sure .env has been loaded before consulting the environment
+    _read_auth_config()
+
     # Try common patterns for API key environment variable names
     patterns = [
         f"{service.upper()}_API_KEY",
@@ -72,6 +101,7 @@ def get_api_key(service: str) -> Optional[str]:
         key = os.getenv(pattern)
         if key:
             logger.info(f"Found API key for {service} using pattern {pattern}")
+            _api_keys[service] = key
             return key
 
     logger.warning(f"No API key found for service: {service}")
@@ -88,7 +118,7 @@ def validate_auth_config(required_keys: list) -> bool:
     Returns:
         True if all required keys are present, False otherwise
     """
-    auth_config = load_auth_config()
+    auth_config = _read_auth_config()
     missing_keys = []
 
     for key in required_keys:
@@ -119,7 +149,9 @@ def get_bearer_token(service: str = None) -> Optional[str]:
         if token:
             return token
 
-    # Try generic bearer token
+    # Try generic bearer token; .env is loaded first, but the environment is
+    # read on every call so a token set after a miss is still found
+    _read_auth_config()
     token = os.getenv("BEARER_TOKEN") or os.getenv("ACCESS_TOKEN")
     if token:
         return token
@@ -143,8 +175,22 @@ def create_auth_headers(
     """
     headers = {}
 
-    token = get_bearer_token(service)
-    if token:
-        headers["Authorization"] = f"{token_type} {token}"
+    authorization = _authorization_header(service, token_type)
+    if authorization:
+        headers["Authorization"] = authorization
 
     return headers
+
+
+def _authorization_header(service: Optional[str], token_type: str) -> Optional[str]:
+    """Build the Authorization header value once per service and token type."""
+    cache_key = (service, token_type)
+    header = _authorization_headers.get(cache_key)
+    if header:
+        return header
+
+    token = get_bearer_token(service)
+    if token:
+        header = _authorization_headers[cache_key] = f"{token_type} {token}"
+        return header
+    return None
@@ -2,19 +2,30 @@
 Configuration utilities for Web Search MCP Server
 """
 
+import copy
 import logging
 import os
 import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
-
-try:
-    import yaml
-except ImportError:
-    yaml = None
+from typing import Any, Dict, Optional, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
+# PyYAML is imported on first use: False until then, None if unavailable
+_yaml_module: Any = False
+
+# Marks a missing key in dot notation lookups
+_MISSING = object()
+
+# Environment values converted to booleans
+_BOOL_STRINGS = frozenset(('true', 'false'))
+
+# Numeric environment values, matched before parsing to avoid exceptions
+_NUMERIC_LEADING_CHARS = frozenset('+-.0123456789')
+_INT_RE = re.compile(r'[+-]?\d+')
+_FLOAT_RE = re.compile(r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?')
+
 
 class ConfigValidationError(Exception):
     """Exception raised for configuration validation errors."""
@@ -40,12 +51,19 @@ class ConfigManager:
         """
         self._config_path = config_path
         self._config = None
+        # Dot path -> looked up value (or _MISSING), cleared on any change
+        self._get_cache: Dict[str, Any] = {}
         self.reload()
     
     @property
     def config(self) -> Dict[str, Any]:
-        """Get the current configuration."""
-        return self._config
+        """
+        Get a copy of the current configuration.
+        
+        Changes must go through ``set()`` so the ``get()`` cache stays valid;
+        edits to the returned dictionary are not seen by the manager.
+        """
+        return copy.deepcopy(self._config)
     
     def reload(self) -> None:
         """Reload configuration from file and environment variables."""
@@ -54,40 +72,47 @@ class ConfigManager:
         
         # Apply environment variable overrides
         self._apply_environment_overrides()
+        self._get_cache.clear()
     
     def _apply_environment_overrides(self) -> None:
         """Apply environment variable overrides to configuration."""
         env_prefix = "WEB_SEARCH_"
+        overrides = {
+            key: value for key, value in os.environ.items()
+            if key.startswith(env_prefix)
+        }
+        if not overrides:
+            return
         
-        for key, value in os.environ.items():
-            if key.startswith(env_prefix):
-                # Convert WEB_SEARCH_SERVER_PORT to server.port
-                config_path = key[len(env_prefix):].lower().replace('_', '.')
-                
-                # Convert string values to appropriate types
-                converted_value = self._convert_env_value(value)
-                
-                # Set the value in config
-                self.set(config_path, converted_value)
+        prefix_length = len(env_prefix)
+        for key, value in overrides.items():
+            # Convert WEB_SEARCH_SERVER_PORT to server.port
+            config_path = key[prefix_length:].lower().replace('_', '.')
+            
+            # Convert string values to appropriate types
+            converted_value = self._convert_env_value(value)
+            
+            # Set the value in config
+            self.set(config_path, converted_value)
     
     def _convert_env_value(self, value: str) -> Union[str, int, float, bool]:
         """Convert environment variable string to appropriate type."""
         # Boolean conversion
-        if value.lower() in ('true', 'false'):
-            return value.lower() == 'true'
+        lowered = value.lower()
+        if lowered in _BOOL_STRINGS:
+            return lowered == 'true'
+        
+        # Only values that look numeric are worth parsing
+        if value[:1] not in _NUMERIC_LEADING_CHARS:
+            return value
         
         # Integer conversion
-        try:
-            if '.' not in value:
-                return int(value)
-        except ValueError:
-            pass
+        if _INT_RE.fullmatch(value):
+            return int(value)
         
         # Float conversion
-        try:
+        if _FLOAT_RE.fullmatch(value):
             return float(value)
-        except ValueError:
-            pass
         
         # Return as string if no conversion possible
         return value
@@ -103,7 +128,11 @@ class ConfigManager:
         Returns:
             Configuration value or default
         """
-        return get_config_value(self._config, path, default)
+        try:
+            value = self._get_cache[path]
+        except KeyError:
+            value = self._get_cache[path] = get_config_value(self._config, path, _MISSING)
+        return default if value is _MISSING else value
     
     def set(self, path: str, value: Any) -> None:
         """
@@ -113,17 +142,19 @@ class ConfigManager:
             path: Dot notation path (e.g., "server.host")
             value: Value to set
         """
-        keys = path.split('.')
+        keys = _split_path(path)
         config = self._config
         
-        # Navigate to the parent dictionary
+        # Navigate to the parent dictionary, one lookup per level
         for key in keys[:-1]:
-            if key not in config:
-                config[key] = {}
-            config = config[key]
+            child = config.get(key)
+            if not isinstance(child, dict):
+                child = config[key] = {}
+            config = child
         
         # Set the final value
         config[keys[-1]] = value
+        self._get_cache.clear()
     
     def validate(self) -> bool:
         """
@@ -224,33 +255,93 @@ def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
                 config_path = path
                 break
 
-    if config_path and Path(config_path).exists():
+    stat = None
+    if config_path:
+        try:
+            stat = os.stat(config_path)
+        except OSError:
+            pass
+
+    if stat is not None:
         logger.info(f"Loading config from: {config_path}")
 
+        yaml = _import_yaml()
         if yaml is None:
             logger.warning("PyYAML not installed, using default config")
             return _default_config()
 
+        # Key on the absolute path so relative spellings share one entry;
+        # failures raise out of the cache, so a transient error is retried
         try:
-            with open(config_path, "r", encoding="utf-8") as f:
-                config = yaml.safe_load(f)
-                if config is None:  # Handle empty files
-                    logger.warning("Config file is empty, using defaults")
-                    return _default_config()
-                    
-                logger.info("Config file loaded successfully")
-                return _merge_with_defaults(config)
+            config = _load_config_file(
+                os.path.abspath(config_path), stat.st_mtime_ns, stat.st_size
+            )
         except yaml.YAMLError as e:
             logger.warning(f"Error parsing config file: {e}. Using defaults.")
             return _default_config()
         except Exception as e:
             logger.warning(f"Error loading config file: {e}. Using defaults.")
             return _default_config()
+
+        # Callers may mutate their config, so never hand out the cached copy
+        return copy.deepcopy(config)
     else:
         logger.info("No config file found. Using default configuration.")
         return _default_config()
 
 
+def _import_yaml() -> Any:
+    """
+    Import PyYAML on first use, so importing this module stays cheap.
+
+    Returns:
+        The yaml module, or None if PyYAML is not installed
+    """
+    global _yaml_module
+    if _yaml_module is False:
+        try:
+            import yaml
+        except ImportError:
+            yaml = None
+        _yaml_module = yaml
+    return _yaml_module
+
+
+@lru_cache(maxsize=8)
+def _load_config_file(config_path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """
+    Parse a YAML config file and merge it with defaults.
+
+    Successful results are cached per file version; the modification time
+    and size are part of the key so an edited file is parsed again. Errors
+    propagate and are never cached.
+
+    Args:
+        config_path: Path to configuration file
+        mtime_ns: File modification time in nanoseconds
+        size: File size in bytes
+
+    Returns:
+        Merged configuration (shared, must not be mutated)
+
+    Raises:
+        yaml.YAMLError: If the file is not valid YAML
+        OSError: If the file cannot be read
+    """
+    yaml = _import_yaml()
+    # libyaml-backed loader when PyYAML was built with it
+    loader = getattr(yaml, "CSafeLoader", None) or yaml.SafeLoader
+
+    with open(config_path, "r", encoding="utf-8") as f:
+        config = yaml.load(f, Loader=loader)
+    if config is None:  # Handle empty files
+        logger.warning("Config file is empty, using defaults")
+        return _default_config()
+
+    logger.info("Config file loaded successfully")
+    return _merge_with_defaults(config)
+
+
 def _default_config() -> Dict[str, Any]:
     """Default configuration if file not found."""
     return {
@@ -293,23 +384,21 @@ def _merge_with_defaults(config: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Merged configuration
     """
-    defaults = _default_config()
+    # The defaults are freshly built, so they are merged into in place;
+    # branches without overrides are never copied
+    result = _default_config()
+    stack = [(result, config)]
 
-    # Simple recursive merge
-    def merge_dict(base: Dict, override: Dict) -> Dict:
-        result = base.copy()
+    while stack:
+        base, override = stack.pop()
         for key, value in override.items():
-            if (
-                key in result
-                and isinstance(result[key], dict)
-                and isinstance(value, dict)
-            ):
-                result[key] = merge_dict(result[key], value)
+            current = base.get(key)
+            if isinstance(current, dict) and isinstance(value, dict):
+                stack.append((current, value))
             else:
-                result[key] = value
-        return result
+                base[key] = value
 
-    return merge_dict(defaults, config)
+    return result
 
 
 def get_env_var(key: str, default: Any = None) -> Any:
@@ -338,12 +427,17 @@ def get_config_value(config: Dict[str, Any], path: str, default: Any = None) ->
     Returns:
         Configuration value or default
     """
-    keys = path.split(".")
     value = config
-
-    try:
-        for key in keys:
-            value = value[key]
-        return value
-    except (KeyError, TypeError):
-        return default
+    for key in _split_path(path):
+        if not isinstance(value, dict):
+            return default
+        value = value.get(key, _MISSING)
+        if value is _MISSING:
+            return default
+    return value
+
+
+@lru_cache(maxsize=256)
+def _split_path(path: str) -> Tuple[str, ...]:
+    """Split a dot notation path into keys, once per distinct path."""
+    return tuple(path.split("."))
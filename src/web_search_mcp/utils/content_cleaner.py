@@ -1,13 +1,57 @@
 """Content cleaning utility for removing ads, navigation, and XSS threats."""
 
+import hashlib
 import re
 import time
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 from enum import Enum
-from typing import List, Optional, Set
+from typing import List, Optional, Set, Tuple, Union
 
 from bs4 import BeautifulSoup, Comment
-import bleach
+from bs4.dammit import EntitySubstitution
+from bs4.element import NavigableString, PreformattedString, TemplateString
+from bs4.formatter import HTMLFormatter
+import soupsieve
+
+try:
+    import lxml  # noqa: F401
+    _HTML_PARSER = 'lxml'
+except ImportError:  # pragma: no cover - lxml is a listed requirement
+    _HTML_PARSER = 'html.parser'
+
+# bleach pulls in html5lib, so it is only imported for strict cleaning
+_bleach_module = None
+
+
+def _import_bleach():
+    """Import bleach on first use and keep the module for later calls."""
+    global _bleach_module
+    if _bleach_module is None:
+        import bleach
+        _bleach_module = bleach
+    return _bleach_module
+
+
+# String types that count as visible text
+_TEXT_STRING_TYPES = (NavigableString, TemplateString)
+
+# Attributes that may carry javascript: URLs
+_URL_ATTRIBUTES = frozenset(('href', 'src', 'action'))
+
+# URL schemes kept on allowed attributes, matching bleach's defaults
+_ALLOWED_PROTOCOLS = frozenset(('http', 'https', 'mailto'))
+_URL_SCHEME_RE = re.compile(r'([^/:?#]+):')
+
+# Minimal escaping like str(soup), but void elements serialize as <br>
+_HTML_FORMATTER = HTMLFormatter(
+    entity_substitution=EntitySubstitution.substitute_xml,
+    void_element_close_prefix=None
+)
+
+# Whitespace normalization: tabs become spaces, blank-line runs use a regex
+_TAB_TABLE = str.maketrans('\t', ' ')
+_PARAGRAPH_BREAK_RE = re.compile(r'\n\s*\n\s*\n+')
 
 
 class CleaningProfile(Enum):
@@ -35,6 +79,33 @@ class CleaningResult:
     processing_time: float
 
 
+def _selector_label(selector: str) -> str:
+    """Derive the removed_elements label for a CSS selector."""
+    return selector.replace('.', '').replace('#', '').replace('[', '').split('*')[0]
+
+
+# Combined pattern plus (label, pattern) for each selector in the group
+_SelectorGroup = Tuple[soupsieve.SoupSieve, Tuple[Tuple[str, soupsieve.SoupSieve], ...]]
+
+
+def _compile_selector_group(selectors: List[str]) -> _SelectorGroup:
+    """
+    Compile a selector list into one combined pattern plus labelled parts.
+    
+    The combined pattern finds every match in a single tree walk; the
+    per-selector patterns are only run against those matches to label them.
+    """
+    combined = soupsieve.compile(', '.join(selectors))
+    labelled = tuple((_selector_label(selector), soupsieve.compile(selector)) for selector in selectors)
+    return combined, labelled
+
+
+def _is_allowed_url(value: str) -> bool:
+    """Check a URL is relative or uses an allowed scheme."""
+    match = _URL_SCHEME_RE.match(''.join(value.split()))
+    return match is None or match.group(1).lower() in _ALLOWED_PROTOCOLS
+
+
 class ContentCleaner:
     """Utility for cleaning web content by removing ads, navigation, and XSS threats."""
 
@@ -69,25 +140,25 @@ class ContentCleaner:
     ]
 
     # Dangerous elements for XSS prevention
-    DANGEROUS_TAGS = [
+    DANGEROUS_TAGS = frozenset({
         'script', 'object', 'embed', 'applet', 'iframe', 'frame', 'frameset'
-    ]
+    })
 
     # Dangerous attributes
-    DANGEROUS_ATTRIBUTES = [
+    DANGEROUS_ATTRIBUTES = frozenset({
         'onclick', 'onload', 'onmouseover', 'onmouseout', 'onfocus', 'onblur',
         'onchange', 'onsubmit', 'onreset', 'onselect', 'onkeydown', 'onkeyup',
         'onkeypress', 'onerror', 'onabort'
-    ]
+    })
 
-    # Allowed HTML tags for bleach
-    ALLOWED_TAGS = [
+    # Allowed HTML tags in cleaned HTML
+    ALLOWED_TAGS = frozenset({
         'p', 'br', 'strong', 'b', 'em', 'i', 'u', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
         'ul', 'ol', 'li', 'blockquote', 'pre', 'code', 'table', 'thead', 'tbody',
         'tr', 'td', 'th', 'div', 'span', 'a', 'img', 'figure', 'figcaption'
-    ]
+    })
 
-    # Allowed attributes for bleach
+    # Allowed attributes in cleaned HTML
     ALLOWED_ATTRIBUTES = {
         'a': ['href', 'title'],
         'img': ['src', 'alt', 'title', 'width', 'height'],
@@ -98,13 +169,37 @@ class ContentCleaner:
         'td': ['colspan', 'rowspan']
     }
 
-    def __init__(self):
-        """Initialize the content cleaner."""
-        pass
+    # Non-content elements removed by aggressive cleaning
+    AGGRESSIVE_SELECTORS = [
+        '.social-share', '.social-sharing', '.share-buttons',
+        '.comments', '.comment-section', '.related-articles', '.related-posts',
+        '.author-bio', '.author-info', '.tags', '.categories'
+    ]
+
+    # Allowed attributes as sets for the allowlist pass
+    _ALLOWED_ATTRIBUTE_SETS = {tag: frozenset(attrs) for tag, attrs in ALLOWED_ATTRIBUTES.items()}
+
+    # Selector groups compiled once for all instances
+    _AD_GROUP = _compile_selector_group(AD_SELECTORS)
+    _AGGRESSIVE_GROUP = _compile_selector_group(AGGRESSIVE_SELECTORS)
+    _NAVIGATION_GROUP = _compile_selector_group(NAVIGATION_SELECTORS)
+    _ACADEMIC_PATTERN = soupsieve.compile(', '.join(ACADEMIC_PRESERVE_SELECTORS))
+
+    def __init__(self, cache_size: int = 256, strict: bool = False):
+        """
+        Initialize the content cleaner.
+        
+        Args:
+            cache_size: Maximum number of cleaning results kept for repeat content
+            strict: Run the cleaned HTML through bleach as an extra security pass
+        """
+        self.cache_size = cache_size
+        self.strict = strict
+        self._cache: OrderedDict[Tuple[str, str, Tuple[str, ...]], CleaningResult] = OrderedDict()
 
     def clean_content(
         self,
-        html_content: str,
+        html_content: Union[str, bytes],
         profile: CleaningProfile,
         custom_remove_selectors: Optional[List[str]] = None
     ) -> CleaningResult:
@@ -112,7 +207,7 @@ class ContentCleaner:
         Clean HTML content based on the specified profile.
         
         Args:
-            html_content: Raw HTML content to clean
+            html_content: Raw HTML content to clean (bytes are decoded as UTF-8)
             profile: Cleaning profile to use
             custom_remove_selectors: Additional CSS selectors to remove
             
@@ -125,21 +220,54 @@ class ContentCleaner:
         if html_content is None:
             raise CleaningError("Content cannot be None")
         
+        if isinstance(html_content, bytes):
+            html_content = html_content.decode('utf-8', 'replace')
+        elif not isinstance(html_content, str):
+            raise CleaningError(f"Content must be str or bytes, not {type(html_content).__name__}")
+        
+        # Nothing to parse in empty or whitespace-only content
+        if not html_content or html_content.isspace():
+            return CleaningResult(
+                cleaned_html='',
+                cleaned_text='',
+                removed_elements=[],
+                security_issues=[],
+                cleaning_profile=profile,
+                word_count=0,
+                processing_time=0.0
+            )
+        
         start_time = time.time()
-        removed_elements = []
-        security_issues = []
+        cache_key = (
+            hashlib.blake2b(html_content.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest(),
+            profile.value,
+            tuple(custom_remove_selectors or ())
+        )
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            self._cache.move_to_end(cache_key)
+            return replace(
+                cached,
+                removed_elements=list(cached.removed_elements),
+                security_issues=list(cached.security_issues),
+                processing_time=time.time() - start_time
+            )
+        
+        removed_elements: Set[str] = set()
+        security_issues: Set[str] = set()
 
         try:
             # Parse HTML with BeautifulSoup
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = BeautifulSoup(html_content, _HTML_PARSER)
 
-            # Remove comments
-            for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
+            # Remove comments; find_all(string=Comment) would treat the class
+            # as a predicate and match every string, so walk the nodes directly
+            comments = [node for node in soup.descendants if isinstance(node, Comment)]
+            for comment in comments:
                 comment.extract()
 
             # Security cleaning (all profiles)
-            self._remove_dangerous_elements(soup, removed_elements, security_issues)
-            self._sanitize_attributes(soup, security_issues)
+            self._sanitize_tree(soup, removed_elements, security_issues)
 
             # Profile-specific cleaning
             if profile == CleaningProfile.MINIMAL:
@@ -160,20 +288,22 @@ class ContentCleaner:
             if custom_remove_selectors:
                 self._remove_custom_selectors(soup, custom_remove_selectors, removed_elements)
 
-            # Get cleaned HTML
-            cleaned_html = str(soup)
+            # Extract clean text before the allowlist pass; stripping tags
+            # keeps their text, so the result would be the same afterwards
+            cleaned_text = self._extract_text_with_alt(soup)
 
-            # Additional security pass with bleach
-            cleaned_html = bleach.clean(
-                cleaned_html,
-                tags=self.ALLOWED_TAGS,
-                attributes=self.ALLOWED_ATTRIBUTES,
-                strip=True
-            )
+            # Restrict the tree to allowed tags and attributes, then serialize
+            self._apply_allowlist(soup)
+            cleaned_html = soup.decode(formatter=_HTML_FORMATTER)
 
-            # Extract clean text
-            text_soup = BeautifulSoup(cleaned_html, 'html.parser')
-            cleaned_text = self._extract_text_with_alt(text_soup)
+            # Optional additional security pass with bleach
+            if self.strict:
+                cleaned_html = _import_bleach().clean(
+                    cleaned_html,
+                    tags=self.ALLOWED_TAGS,
+                    attributes=self.ALLOWED_ATTRIBUTES,
+                    strip=True
+                )
 
             # Normalize whitespace
             cleaned_text = self._normalize_whitespace(cleaned_text)
@@ -183,11 +313,11 @@ class ContentCleaner:
 
             processing_time = time.time() - start_time
 
-            return CleaningResult(
+            result = CleaningResult(
                 cleaned_html=cleaned_html,
                 cleaned_text=cleaned_text,
-                removed_elements=list(set(removed_elements)),
-                security_issues=list(set(security_issues)),
+                removed_elements=list(removed_elements),
+                security_issues=list(security_issues),
                 cleaning_profile=profile,
                 word_count=word_count,
                 processing_time=processing_time
@@ -196,113 +326,151 @@ class ContentCleaner:
         except Exception as e:
             raise CleaningError(f"Failed to clean content: {str(e)}")
 
+        # Keep a private copy so callers mutating their result cannot alter it
+        if self.cache_size > 0:
+            self._cache[cache_key] = replace(
+                result,
+                removed_elements=list(result.removed_elements),
+                security_issues=list(result.security_issues)
+            )
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return result
+
     def _extract_text_with_alt(self, soup: BeautifulSoup) -> str:
         """Extract text content including alt text from images."""
-        # Get regular text
-        text_parts = []
-        
-        for element in soup.find_all(string=True):
-            if element.parent.name not in ['script', 'style']:
-                text_parts.append(element.strip())
+        # Only plain text strings; script/style contents, comments, doctypes
+        # and CDATA have their own string types and are skipped
+        text = soup.get_text(separator=' ', strip=True, types=_TEXT_STRING_TYPES)
         
         # Add alt text from images
-        for img in soup.find_all('img'):
-            alt_text = img.get('alt', '').strip()
-            if alt_text:
-                text_parts.append(alt_text)
+        alt_texts = [img.get('alt', '').strip() for img in soup.find_all('img')]
+        
+        return ' '.join(filter(None, [text, *alt_texts]))
+
+    def _sanitize_tree(self, soup: BeautifulSoup, removed_elements: Set[str], security_issues: Set[str]):
+        """Remove dangerous elements and attributes in a single tree walk."""
+        dangerous_tags = self.DANGEROUS_TAGS
+        dangerous_attributes = self.DANGEROUS_ATTRIBUTES
         
-        return ' '.join(filter(None, text_parts))
-
-    def _remove_dangerous_elements(self, soup: BeautifulSoup, removed_elements: List[str], security_issues: List[str]):
-        """Remove dangerous HTML elements that could contain XSS."""
-        for tag_name in self.DANGEROUS_TAGS:
-            elements = soup.find_all(tag_name)
-            if elements:
-                for element in elements:
-                    element.decompose()
-                removed_elements.append(tag_name)
-                security_issues.append("xss_script" if tag_name == "script" else "dangerous_element")
-
-    def _sanitize_attributes(self, soup: BeautifulSoup, security_issues: List[str]):
-        """Remove dangerous attributes from HTML elements."""
-        for element in soup.find_all():
-            # Check for dangerous event handlers
-            for attr in list(element.attrs.keys()):
-                if attr.lower() in self.DANGEROUS_ATTRIBUTES:
-                    del element.attrs[attr]
-                    security_issues.append("xss_event_handler")
+        for element in soup.find_all(True):
+            # Descendants of a removed element are destroyed along with it
+            if element.decomposed:
+                continue
+            
+            tag_name = element.name
+            if tag_name in dangerous_tags:
+                element.decompose()
+                removed_elements.add(tag_name)
+                security_issues.add("xss_script" if tag_name == "script" else "dangerous_element")
+                continue
+            
+            attrs = element.attrs
+            if not attrs:
+                continue
+            
+            for attr in list(attrs):
+                lowered = attr.lower()
+                
+                # Check for dangerous event handlers
+                if lowered in dangerous_attributes:
+                    del attrs[attr]
+                    security_issues.add("xss_event_handler")
                 
                 # Check for javascript: URLs
-                if attr.lower() in ['href', 'src', 'action'] and element.attrs.get(attr, '').startswith('javascript:'):
-                    del element.attrs[attr]
-                    security_issues.append("xss_javascript_url")
-
-    def _remove_ads(self, soup: BeautifulSoup, removed_elements: List[str]):
+                elif lowered in _URL_ATTRIBUTES:
+                    value = attrs[attr]
+                    if isinstance(value, str) and value.lstrip().lower().startswith('javascript:'):
+                        del attrs[attr]
+                        security_issues.add("xss_javascript_url")
+
+    def _apply_allowlist(self, soup: BeautifulSoup):
+        """Strip disallowed tags (keeping their text) and attributes in place."""
+        # Doctypes, CDATA, processing instructions and declarations
+        markup = [node for node in soup.descendants if isinstance(node, PreformattedString)]
+        for node in markup:
+            node.extract()
+        
+        allowed_tags = self.ALLOWED_TAGS
+        allowed_attributes = self._ALLOWED_ATTRIBUTE_SETS
+        no_attributes = frozenset()
+        
+        for element in soup.find_all(True):
+            if element.name not in allowed_tags:
+                element.unwrap()
+                continue
+            
+            attrs = element.attrs
+            if not attrs:
+                continue
+            
+            permitted = allowed_attributes.get(element.name, no_attributes)
+            for attr in list(attrs):
+                if attr not in permitted:
+                    del attrs[attr]
+                elif attr in _URL_ATTRIBUTES and not _is_allowed_url(attrs[attr]):
+                    del attrs[attr]
+
+    def _remove_ads(self, soup: BeautifulSoup, removed_elements: Set[str]):
         """Remove advertisement elements."""
-        for selector in self.AD_SELECTORS:
-            elements = soup.select(selector)
-            if elements:
-                for element in elements:
-                    element.decompose()
-                removed_elements.append(selector.replace('.', '').replace('#', '').replace('[', '').split('*')[0])
-
-    def _remove_navigation(self, soup: BeautifulSoup, removed_elements: List[str]):
+        self._remove_selector_group(soup, self._AD_GROUP, removed_elements)
+
+    def _remove_selector_group(
+        self,
+        soup: BeautifulSoup,
+        group: _SelectorGroup,
+        removed_elements: Set[str],
+        label_prefix: str = '',
+        preserve: Optional[soupsieve.SoupSieve] = None
+    ):
+        """Remove all elements matching a compiled selector group in one walk."""
+        combined, labelled = group
+        elements = combined.select(soup)
+        if preserve is not None:
+            elements = [element for element in elements if not preserve.match(element)]
+        if not elements:
+            return
+
+        # Label before decomposing; matches on destroyed elements are undefined
+        for label, pattern in labelled:
+            if any(pattern.match(element) for element in elements):
+                removed_elements.add(label_prefix + label)
+
+        # Matches come in document order, so an element nested in an earlier
+        # match has already been destroyed along with it
+        for element in elements:
+            if not element.decomposed:
+                element.decompose()
+
+    def _remove_navigation(self, soup: BeautifulSoup, removed_elements: Set[str]):
         """Remove navigation and UI elements."""
-        for selector in self.NAVIGATION_SELECTORS:
-            elements = soup.select(selector) if selector.startswith('.') or selector.startswith('#') else soup.find_all(selector)
-            if elements:
-                for element in elements:
-                    element.decompose()
-                removed_elements.append(selector.replace('.', '').replace('#', ''))
-
-    def _remove_navigation_preserve_academic(self, soup: BeautifulSoup, removed_elements: List[str]):
+        self._remove_selector_group(soup, self._NAVIGATION_GROUP, removed_elements)
+
+    def _remove_navigation_preserve_academic(self, soup: BeautifulSoup, removed_elements: Set[str]):
         """Remove navigation but preserve academic elements."""
-        # First mark academic elements for preservation
-        academic_elements = set()
-        for selector in self.ACADEMIC_PRESERVE_SELECTORS:
-            elements = soup.select(selector)
-            academic_elements.update(elements)
-
-        # Remove navigation elements that aren't academic
-        for selector in self.NAVIGATION_SELECTORS:
-            elements = soup.select(selector) if selector.startswith('.') or selector.startswith('#') else soup.find_all(selector)
-            if elements:
-                for element in elements:
-                    if element not in academic_elements:
-                        element.decompose()
-                        removed_elements.append(selector.replace('.', '').replace('#', ''))
-
-    def _remove_non_content_elements(self, soup: BeautifulSoup, removed_elements: List[str]):
+        self._remove_selector_group(
+            soup, self._NAVIGATION_GROUP, removed_elements, preserve=self._ACADEMIC_PATTERN
+        )
+
+    def _remove_non_content_elements(self, soup: BeautifulSoup, removed_elements: Set[str]):
         """Remove additional non-content elements for aggressive cleaning."""
-        aggressive_selectors = [
-            '.social-share', '.social-sharing', '.share-buttons',
-            '.comments', '.comment-section', '.related-articles', '.related-posts',
-            '.author-bio', '.author-info', '.tags', '.categories'
-        ]
-        
-        for selector in aggressive_selectors:
-            elements = soup.select(selector)
-            if elements:
-                for element in elements:
-                    element.decompose()
-                removed_elements.append(selector.replace('.', ''))
-
-    def _remove_custom_selectors(self, soup: BeautifulSoup, selectors: List[str], removed_elements: List[str]):
+        self._remove_selector_group(soup, self._AGGRESSIVE_GROUP, removed_elements)
+
+    def _remove_custom_selectors(self, soup: BeautifulSoup, selectors: List[str], removed_elements: Set[str]):
         """Remove elements matching custom CSS selectors."""
-        for selector in selectors:
-            elements = soup.select(selector)
-            if elements:
-                for element in elements:
-                    element.decompose()
-                removed_elements.append(f"custom_{selector.replace('.', '').replace('#', '').replace('[', '').split('*')[0]}")
+        self._remove_selector_group(soup, _compile_selector_group(selectors), removed_elements, 'custom_')
 
     def _normalize_whitespace(self, text: str) -> str:
         """Normalize whitespace in text content."""
-        # Replace multiple spaces/tabs with single space
-        text = re.sub(r'[ \t]+', ' ', text)
+        # Replace multiple spaces/tabs with single space; each replace
+        # halves the remaining runs, so long runs take few passes
+        text = text.translate(_TAB_TABLE)
+        while '  ' in text:
+            text = text.replace('  ', ' ')
         
         # Replace multiple newlines with double newlines (paragraph breaks)
-        text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
+        text = _PARAGRAPH_BREAK_RE.sub('\n\n', text)
         
         # Strip leading/trailing whitespace
         text = text.strip()
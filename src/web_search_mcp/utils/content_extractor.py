@@ -8,16 +8,59 @@ from web pages, creating MCP-compliant resources for search results.
 import asyncio
 import re
 import logging
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Any, Optional, Tuple
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Set, Tuple, Union
 from datetime import datetime, timezone
 import httpx
-from bs4 import BeautifulSoup, Comment
+from bs4 import BeautifulSoup, CData, Comment, FeatureNotFound, NavigableString, Tag
 
 from ..utils.logging_config import ContextualLogger
 
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # optional speedup, BeautifulSoup is used instead
+    LexborHTMLParser = None
+
 logger = ContextualLogger(__name__)
 
+# Elements dropped before extraction, and main content containers by priority
+_BOILERPLATE_TAGS = ['script', 'style', 'nav', 'header', 'footer', 'aside', 'menu']
+_BOILERPLATE_TAG_SET = frozenset(_BOILERPLATE_TAGS)
+_MAIN_CONTENT_SELECTORS = ['main', 'article', '[role="main"]', '.content', '.main-content', '.post-content']
+_TEXT_BLOCK_TAGS = ['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'div', 'section']
+_TEXT_BLOCK_TAG_SET = frozenset(_TEXT_BLOCK_TAGS)
+
+# BeautifulSoup string types that count as page text
+_SOUP_TEXT_TYPES = (NavigableString, CData)
+
+# Text cleaning patterns, compiled once
+_TABLE_SEP_RE = re.compile(r'^\s*\|.*?\|\s*$', re.MULTILINE)
+_HR_RE = re.compile(r'^\s*[-=]{3,}\s*$', re.MULTILINE)
+_BRACKET_RE = re.compile(r'\s*\[.*?\]\s*')
+_DOTS_RE = re.compile(r'\.{3,}')
+_DASHES_RE = re.compile(r'-{3,}')
+
+# Streamed bodies stop after this many bytes per character of extracted text
+_BODY_BYTES_PER_CHAR = 20
+_STREAM_CHUNK_SIZE = 65536
+
+# Non-text content types that are still parsed as markup
+_MARKUP_CONTENT_TYPES = frozenset(('application/xhtml+xml', 'application/xml'))
+
+# Recently extracted pages by URL as (monotonic timestamp, content), and
+# fetches in progress so concurrent requests for one URL share a fetch
+_EXTRACT_CACHE_TTL = 300.0
+_EXTRACT_CACHE_SIZE = 256
+_extract_cache: "OrderedDict[str, Tuple[float, ExtractedContent]]" = OrderedDict()
+_extract_inflight: Dict[str, "asyncio.Future[ExtractedContent]"] = {}
+
+# Client used by extract_webpage_content, with the event loop it is bound to
+_default_client: Optional[Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = None
+# Keeps tasks closing stale clients referenced until they finish
+_closing_tasks: Set["asyncio.Task[None]"] = set()
+
 
 class ContentExtractionError(Exception):
     """Exception raised when content extraction fails."""
@@ -47,24 +90,40 @@ class ExtractedContent:
     text: str
     summary: str
     metadata: Optional[Dict[str, Any]] = None
+    word_count: int = field(init=False, default=0)  # Computed once from text
     
     def __post_init__(self):
         """Initialize metadata and calculate word count if not provided."""
         if self.metadata is None:
             self.metadata = {}
         
+        self.word_count = len(self.text.split()) if self.text else 0
+        
         # Add automatic metadata
         self.metadata.setdefault("extraction_time", datetime.now(timezone.utc).isoformat())
         self.metadata.setdefault("word_count", self.word_count)
     
-    @property
-    def word_count(self) -> int:
-        """Calculate word count of the main text content."""
-        return len(self.text.split()) if self.text else 0
-    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
-        return asdict(self)
+        # A flat literal instead of asdict, which deep-copies every value;
+        # only metadata is copied, so callers can edit it independently
+        return {
+            "url": self.url,
+            "title": self.title,
+            "text": self.text,
+            "summary": self.summary,
+            "metadata": dict(self.metadata),
+            "word_count": self.word_count,
+        }
+
+
+def _make_client(timeout: float) -> httpx.AsyncClient:
+    """Create an HTTP client whose keep-alive pool is shared across fetches."""
+    return httpx.AsyncClient(
+        timeout=timeout,
+        follow_redirects=True,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+    )
 
 
 class ContentExtractor:
@@ -75,17 +134,86 @@ class ContentExtractor:
     and creates summaries suitable for MCP resources.
     """
     
-    def __init__(self, timeout: float = 30.0, max_content_length: int = 10000):
+    def __init__(
+        self,
+        timeout: float = 30.0,
+        max_content_length: int = 10000,
+        client: Optional[httpx.AsyncClient] = None
+    ):
         """
         Initialize the ContentExtractor.
         
         Args:
             timeout: HTTP request timeout in seconds
             max_content_length: Maximum content length to extract
+            client: Shared HTTP client to reuse across extractions (optional)
         """
         self.timeout = timeout
         self.max_content_length = max_content_length
         self.logger = ContextualLogger(__name__)
+        self._client = client
+        self._owns_client = False
+    
+    async def __aenter__(self):
+        """Async context manager entry; keeps one HTTP client for all calls."""
+        if self._client is None:
+            self._client = _make_client(self.timeout)
+            self._owns_client = True
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.close()
+    
+    async def close(self):
+        """Close the HTTP client if this extractor created it."""
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._owns_client = False
+    
+    async def _fetch(self, client: httpx.AsyncClient, url: str) -> Tuple[httpx.Response, bytes]:
+        """
+        Stream a URL's body, stopping once enough bytes have arrived.
+        
+        Extracted text is capped at max_content_length characters, so bytes
+        far beyond that (markup included) are never downloaded or parsed.
+        
+        Args:
+            client: HTTP client to fetch with
+            url: URL to fetch
+            
+        Returns:
+            Tuple of (response, body bytes capped at the byte budget)
+            
+        Raises:
+            ContentExtractionError: If the request fails, returns an error status
+                or serves a non-HTML content type
+        """
+        max_bytes = self.max_content_length * _BODY_BYTES_PER_CHAR
+        chunks = []
+        total = 0
+        try:
+            async with client.stream('GET', url, timeout=self.timeout) as response:
+                response.raise_for_status()
+                
+                # Decide from the headers whether the body is worth reading
+                content_type = response.headers.get('content-type', '').split(';', 1)[0].strip().lower()
+                if content_type and not (content_type.startswith('text/') or content_type in _MARKUP_CONTENT_TYPES):
+                    raise ContentExtractionError(f"Unsupported content-type: {content_type}", url=url)
+                if response.headers.get('content-length') == '0':
+                    return response, b''
+                
+                async for chunk in response.aiter_bytes(_STREAM_CHUNK_SIZE):
+                    chunks.append(chunk)
+                    total += len(chunk)
+                    if total >= max_bytes:
+                        break
+        except httpx.RequestError as e:
+            raise ContentExtractionError(f"Failed to fetch content: {str(e)}", url=url)
+        except httpx.HTTPStatusError as e:
+            raise ContentExtractionError(f"HTTP error {e.response.status_code}: {str(e)}", url=url)
+        return response, b''.join(chunks)[:max_bytes]
     
     async def extract_content(self, url: str) -> ExtractedContent:
         """
@@ -101,28 +229,21 @@ class ContentExtractor:
             ContentExtractionError: If extraction fails
         """
         try:
-            self.logger.info(f"Starting content extraction for URL: {url}")
+            self.logger.info("Starting content extraction for URL: %s", url)
             
-            # Fetch the webpage
-            async with httpx.AsyncClient(timeout=self.timeout, follow_redirects=True) as client:
-                try:
-                    response = await client.get(url)
-                    response.raise_for_status()
-                except httpx.RequestError as e:
-                    raise ContentExtractionError(f"Failed to fetch content: {str(e)}", url=url)
-                except httpx.HTTPStatusError as e:
-                    raise ContentExtractionError(f"HTTP error {e.response.status_code}: {str(e)}", url=url)
+            # Fetch the webpage, reusing the shared client's connections
+            if self._client is not None:
+                response, body = await self._fetch(self._client, url)
+            else:
+                async with _make_client(self.timeout) as client:
+                    response, body = await self._fetch(client, url)
             
-            # Extract text content from HTML
-            title, text = extract_text_from_html(response.text)
+            # Extract text content from HTML, decoding as response.text would
+            # (header charset, else UTF-8) so the parser never sniffs it
+            title, text = extract_text_from_html(body, response.encoding)
             
-            # Clean and limit the extracted text
-            cleaned_text = clean_extracted_text(text)
-            if len(cleaned_text) > self.max_content_length:
-                cleaned_text = cleaned_text[:self.max_content_length] + "..."
-            
-            # Create summary
-            summary = create_content_summary(cleaned_text)
+            # Clean and limit the extracted text, and summarize it
+            cleaned_text, summary = clean_and_summarize(text, self.max_content_length)
             
             # Create metadata
             metadata = {
@@ -140,77 +261,250 @@ class ContentExtractor:
                 metadata=metadata
             )
             
-            self.logger.info(f"Successfully extracted content from {url}: {len(cleaned_text)} chars, {extracted_content.word_count} words")
+            self.logger.info(
+                "Successfully extracted content from %s: %d chars, %d words",
+                url, len(cleaned_text), extracted_content.word_count
+            )
             return extracted_content
             
         except ContentExtractionError:
             raise
         except Exception as e:
-            self.logger.error(f"Unexpected error during content extraction from {url}: {str(e)}")
+            self.logger.error("Unexpected error during content extraction from %s: %s", url, e)
             raise ContentExtractionError(f"Extraction failed: {str(e)}", url=url)
 
 
-def extract_text_from_html(html: str) -> Tuple[str, str]:
+def _parse_html(html: Union[str, bytes]) -> BeautifulSoup:
+    """
+    Parse HTML with the C-backed lxml parser, falling back to html.parser.
+    
+    Args:
+        html: Raw HTML content
+        
+    Returns:
+        Parsed BeautifulSoup tree
+    """
+    try:
+        return BeautifulSoup(html, 'lxml')
+    except FeatureNotFound:
+        return BeautifulSoup(html, 'html.parser')
+
+
+def _decode_html(html: bytes, encoding: Optional[str]) -> Union[str, bytes]:
+    """
+    Decode HTML bytes with a known encoding, skipping charset detection.
+    
+    Undecodable bytes (e.g. a character cut off by a size cap) are replaced.
+    Without a usable encoding the bytes are returned for the parser to sniff.
+    """
+    if not encoding:
+        return html
+    try:
+        return html.decode(encoding, 'replace')
+    except LookupError:
+        return html
+
+
+def extract_text_from_html(html: Union[str, bytes], encoding: Optional[str] = None) -> Tuple[str, str]:
     """
     Extract title and main text content from HTML.
     
     Args:
         html: Raw HTML content
+        encoding: Known encoding of byte content (optional)
         
     Returns:
         Tuple of (title, main_text)
     """
+    if isinstance(html, bytes):
+        html = _decode_html(html, encoding)
+    
     try:
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Extract title
-        title_tag = soup.find('title')
-        title = title_tag.get_text().strip() if title_tag else ""
-        
-        # Remove script, style, and other non-content elements
-        for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside', 'menu']):
-            element.decompose()
-        
-        # Remove comments
-        for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
-            comment.extract()
-        
-        # Extract main content - prioritize main content areas
-        main_content = None
-        
-        # Try to find main content containers
-        for selector in ['main', 'article', '[role="main"]', '.content', '.main-content', '.post-content']:
-            main_content = soup.select_one(selector)
-            if main_content:
-                break
-        
-        # If no main content found, use body
-        if not main_content:
-            main_content = soup.find('body') or soup
-        
-        # Extract text, preserving some structure
-        text_parts = []
-        
-        # Get headings and paragraphs
-        for element in main_content.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'div', 'section']):
-            text = element.get_text().strip()
-            if text and len(text) >= 3:  # Skip very short text snippets
-                text_parts.append(text)
-        
-        # If no structured content found, get all text
-        if not text_parts:
-            text_parts = [main_content.get_text()]
-        
-        main_text = '\n\n'.join(text_parts)
+        if LexborHTMLParser is not None:
+            title, main_text = _extract_text_lexbor(html)
+        else:
+            title, main_text = _extract_text_soup(html)
         
-        logger.debug(f"Extracted title: '{title}' and {len(main_text)} characters of text")
+        logger.debug("Extracted title: '%s' and %d characters of text", title, len(main_text))
         return title, main_text
         
     except Exception as e:
-        logger.error(f"Error parsing HTML: {str(e)}")
+        logger.error("Error parsing HTML: %s", e)
+        if isinstance(html, bytes):
+            html = html.decode('utf-8', 'replace')
         return "", html  # Return raw HTML as fallback
 
 
+def _extract_text_lexbor(html: Union[str, bytes]) -> Tuple[str, str]:
+    """
+    Extract title and main text with selectolax's C-backed lexbor tree.
+    
+    Args:
+        html: Raw HTML content
+        
+    Returns:
+        Tuple of (title, main_text)
+    """
+    tree = LexborHTMLParser(html)
+    
+    # Extract title
+    title_node = tree.css_first('title')
+    title = title_node.text().strip() if title_node else ""
+    
+    # Remove non-content elements; reverse document order destroys nested
+    # matches before their ancestors, never after
+    for node in reversed(tree.css(', '.join(_BOILERPLATE_TAGS))):
+        node.decompose()
+    
+    # Extract main content - prioritize main content areas
+    main_content = None
+    for selector in _MAIN_CONTENT_SELECTORS:
+        main_content = tree.css_first(selector)
+        if main_content:
+            break
+    
+    # If no main content found, use body
+    if not main_content:
+        main_content = tree.body or tree.root
+    
+    # Extract headings and paragraphs, each text node once
+    text_parts = _join_block_segments(_lexbor_block_strings(main_content))
+    
+    # If no structured content found, get all text
+    if not text_parts:
+        text_parts = [main_content.text()]
+    
+    return title, '\n\n'.join(text_parts)
+
+
+def _join_block_segments(strings: Iterable[Tuple[Optional[int], str]]) -> List[str]:
+    """
+    Group text into segments by the innermost text block that contains it.
+    
+    Each text node belongs to exactly one block, so nested containers no
+    longer repeat their children's text. A block's own text on either side
+    of a nested block becomes separate segments, keeping document order.
+    
+    Args:
+        strings: (owning block id or None, text) pairs in document order
+        
+    Returns:
+        Text segments of at least three characters
+    """
+    parts = []
+    buffer = []
+    current = None
+    for owner, text in strings:
+        if owner != current:
+            segment = ''.join(buffer).strip()
+            if len(segment) >= 3:  # Skip very short text snippets
+                parts.append(segment)
+            buffer = []
+            current = owner
+        if owner is not None:
+            buffer.append(text)
+    
+    segment = ''.join(buffer).strip()
+    if len(segment) >= 3:
+        parts.append(segment)
+    return parts
+
+
+def _soup_block_strings(container: Tag) -> Iterator[Tuple[Optional[int], str]]:
+    """Yield each text node under a BeautifulSoup container with its owning block."""
+    block_tags = _TEXT_BLOCK_TAG_SET
+    for node in container.descendants:
+        if type(node) not in _SOUP_TEXT_TYPES:
+            continue
+        parent = node.parent
+        while parent is not container and parent.name not in block_tags:
+            parent = parent.parent
+        yield (None if parent is container else id(parent)), node
+
+
+def _lexbor_block_strings(container: Any) -> Iterator[Tuple[Optional[int], str]]:
+    """Yield each text node under a lexbor container with its owning block."""
+    block_tags = _TEXT_BLOCK_TAG_SET
+    container_id = container.mem_id
+    for node in container.traverse(include_text=True):
+        if node.tag != '-text':
+            continue
+        parent = node.parent
+        while parent.mem_id != container_id and parent.tag not in block_tags:
+            parent = parent.parent
+        yield (None if parent.mem_id == container_id else parent.mem_id), node.text_content
+
+
+def _strip_boilerplate(soup: BeautifulSoup) -> None:
+    """
+    Remove boilerplate elements and comments found in a single tree walk.
+    
+    Boilerplate subtrees are not descended into, so nothing nested inside
+    one is visited or removed twice.
+    """
+    boilerplate_tags = _BOILERPLATE_TAG_SET
+    elements = []
+    comments = []
+    stack = [soup]
+    while stack:
+        for child in stack.pop().contents:
+            if isinstance(child, Tag):
+                if child.name in boilerplate_tags:
+                    elements.append(child)
+                else:
+                    stack.append(child)
+            elif isinstance(child, Comment):
+                comments.append(child)
+    
+    for element in elements:
+        element.decompose()
+    for comment in comments:
+        comment.extract()
+
+
+def _extract_text_soup(html: Union[str, bytes]) -> Tuple[str, str]:
+    """
+    Extract title and main text with BeautifulSoup.
+    
+    Args:
+        html: Raw HTML content
+        
+    Returns:
+        Tuple of (title, main_text)
+    """
+    soup = _parse_html(html)
+    
+    # Extract title
+    title_tag = soup.find('title')
+    title = title_tag.get_text().strip() if title_tag else ""
+    
+    # Remove script, style, and other non-content elements plus comments
+    _strip_boilerplate(soup)
+    
+    # Extract main content - prioritize main content areas
+    main_content = None
+    
+    # Try to find main content containers
+    for selector in _MAIN_CONTENT_SELECTORS:
+        main_content = soup.select_one(selector)
+        if main_content:
+            break
+    
+    # If no main content found, use body
+    if not main_content:
+        main_content = soup.find('body') or soup
+    
+    # Extract text, preserving some structure: headings and paragraphs,
+    # each text node once
+    text_parts = _join_block_segments(_soup_block_strings(main_content))
+    
+    # If no structured content found, get all text
+    if not text_parts:
+        text_parts = [main_content.get_text()]
+    
+    return title, '\n\n'.join(text_parts)
+
+
 def clean_extracted_text(text: str) -> str:
     """
     Clean extracted text by normalizing whitespace and removing artifacts.
@@ -224,19 +518,19 @@ def clean_extracted_text(text: str) -> str:
     if not text:
         return ""
     
-    # Normalize whitespace
-    text = re.sub(r'\s+', ' ', text)  # Multiple spaces to single space
-    text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)  # Multiple newlines to double newline
-    text = re.sub(r'\t+', ' ', text)  # Tabs to spaces
+    # Collapse every whitespace run (spaces, tabs, newlines) to one space in
+    # a single C-level pass; the text is a single line from here on, so
+    # separate newline and tab passes would never match
+    text = ' '.join(text.split())
     
     # Remove common web artifacts
-    text = re.sub(r'^\s*\|.*?\|\s*$', '', text, flags=re.MULTILINE)  # Table separators
-    text = re.sub(r'^\s*[-=]{3,}\s*$', '', text, flags=re.MULTILINE)  # Horizontal rules
-    text = re.sub(r'\s*\[.*?\]\s*', ' ', text)  # Remove bracketed content (often navigation)
+    text = _TABLE_SEP_RE.sub('', text)  # Table separators
+    text = _HR_RE.sub('', text)  # Horizontal rules
+    text = _BRACKET_RE.sub(' ', text)  # Remove bracketed content (often navigation)
     
     # Clean up excessive punctuation
-    text = re.sub(r'\.{3,}', '...', text)  # Multiple dots to ellipsis
-    text = re.sub(r'-{3,}', '---', text)  # Multiple dashes
+    text = _DOTS_RE.sub('...', text)  # Multiple dots to ellipsis
+    text = _DASHES_RE.sub('---', text)  # Multiple dashes
     
     return text.strip()
 
@@ -262,11 +556,13 @@ def create_content_summary(text: str, max_length: int = 300) -> str:
     # Find a good cutoff point at sentence boundary
     truncated = text[:max_length]
     
-    # Try to cut at sentence boundary
+    # Try to cut at sentence boundary; only boundaries past 70% of the
+    # length are usable, so the C-level rfinds scan just that tail
+    sentence_start = int(max_length * 0.7) + 1
     sentence_end = max(
-        truncated.rfind('.'),
-        truncated.rfind('!'),
-        truncated.rfind('?')
+        truncated.rfind('.', sentence_start),
+        truncated.rfind('!', sentence_start),
+        truncated.rfind('?', sentence_start)
     )
     
     if sentence_end > max_length * 0.7:  # If we found a good sentence boundary
@@ -275,7 +571,7 @@ def create_content_summary(text: str, max_length: int = 300) -> str:
             summary = summary.rstrip('.!?') + "..."
     else:
         # Cut at word boundary
-        last_space = truncated.rfind(' ')
+        last_space = truncated.rfind(' ', int(max_length * 0.8) + 1)
         if last_space > max_length * 0.8:
             summary = text[:last_space] + "..."
         else:
@@ -284,10 +580,43 @@ def create_content_summary(text: str, max_length: int = 300) -> str:
     return summary.strip()
 
 
+def clean_and_summarize(
+    text: str,
+    max_content_length: int,
+    summary_length: int = 300
+) -> Tuple[str, str]:
+    """
+    Clean extracted text, cap its length and summarize it in one call.
+    
+    The summary only reads the first ``summary_length`` characters, so it is
+    taken from the cleaned text directly rather than from a truncated copy
+    whenever the cap cannot affect it.
+    
+    Args:
+        text: Raw extracted text
+        max_content_length: Maximum length of the cleaned text before "..."
+        summary_length: Maximum length of the summary
+        
+    Returns:
+        Tuple of (cleaned_text, summary)
+    """
+    cleaned_text = clean_extracted_text(text)
+    if len(cleaned_text) <= max_content_length:
+        return cleaned_text, create_content_summary(cleaned_text, summary_length)
+    
+    content = cleaned_text[:max_content_length] + "..."
+    if max_content_length > summary_length:
+        # Both strings share the prefix the summary reads and both continue
+        # past it, so the summary is identical either way
+        return content, create_content_summary(cleaned_text, summary_length)
+    return content, create_content_summary(content, summary_length)
+
+
 def create_mcp_content_resource(
     extracted_content: ExtractedContent, 
     index: int,
-    query: Optional[str] = None
+    query: Optional[str] = None,
+    now: Optional[datetime] = None
 ) -> Dict[str, Any]:
     """
     Create an MCP resource from extracted content.
@@ -296,6 +625,8 @@ def create_mcp_content_resource(
         extracted_content: ExtractedContent object
         index: Resource index for URI generation
         query: Original search query (optional)
+        now: Timestamp to stamp on the resource (optional); defaults to the
+            content's extraction time so the clock is read once per page
         
     Returns:
         MCP resource dictionary
@@ -314,10 +645,17 @@ def create_mcp_content_resource(
     content_text = "\n\n".join(content_parts)
     
     # Create metadata
+    if now is not None:
+        timestamp = now.isoformat()
+    else:
+        timestamp = (extracted_content.metadata or {}).get("extraction_time")
+        if not timestamp:
+            timestamp = datetime.now(timezone.utc).isoformat()
+    
     metadata = {
         "source_url": extracted_content.url,
         "extraction_type": "webpage",
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": timestamp,
         "word_count": extracted_content.word_count,
         "content_index": index
     }
@@ -350,6 +688,9 @@ async def extract_webpage_content(url: str, timeout: float = 30.0) -> ExtractedC
     """
     Standalone function to extract content from a webpage.
     
+    Results are cached per URL for five minutes, and concurrent calls for
+    the same URL share a single fetch.
+    
     Args:
         url: URL to extract content from
         timeout: Request timeout in seconds
@@ -360,5 +701,129 @@ async def extract_webpage_content(url: str, timeout: float = 30.0) -> ExtractedC
     Raises:
         ContentExtractionError: If extraction fails
     """
-    extractor = ContentExtractor(timeout=timeout)
-    return await extractor.extract_content(url) 
\ No newline at end of file
+    hit = _extract_cache.get(url)
+    if hit is not None:
+        if time.monotonic() - hit[0] < _EXTRACT_CACHE_TTL:
+            _extract_cache.move_to_end(url)
+            return hit[1]
+        del _extract_cache[url]
+    
+    pending = _extract_inflight.get(url)
+    if pending is not None:
+        try:
+            return await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            # Only the fetching task was cancelled, not this one: fetch anew
+            if not pending.cancelled():
+                raise
+        return await extract_webpage_content(url, timeout)
+    
+    future = asyncio.get_running_loop().create_future()
+    _extract_inflight[url] = future
+    try:
+        extractor = ContentExtractor(timeout=timeout, client=_get_default_client())
+        result = await extractor.extract_content(url)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except BaseException as e:
+        future.set_exception(e)
+        future.exception()  # Mark retrieved when nobody else is waiting
+        raise
+    else:
+        _extract_cache[url] = (time.monotonic(), result)
+        if len(_extract_cache) > _EXTRACT_CACHE_SIZE:
+            _extract_cache.popitem(last=False)
+        future.set_result(result)
+        return result
+    finally:
+        del _extract_inflight[url]
+
+
+async def extract_many(
+    urls: List[str],
+    timeout: float = 30.0,
+    concurrency: int = 8
+) -> List[Union[ExtractedContent, ContentExtractionError]]:
+    """
+    Extract content from several webpages concurrently.
+    
+    Fetches overlap up to the concurrency limit and share one HTTP client.
+    A failing URL does not abort the batch; its error takes its place.
+    
+    Args:
+        urls: URLs to extract content from
+        timeout: Request timeout in seconds
+        concurrency: Maximum number of simultaneous fetches
+        
+    Returns:
+        One ExtractedContent or ContentExtractionError per URL, in input order
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async with ContentExtractor(timeout=timeout) as extractor:
+        async def extract_one(url: str) -> Union[ExtractedContent, ContentExtractionError]:
+            async with semaphore:
+                try:
+                    return await extractor.extract_content(url)
+                except ContentExtractionError as e:
+                    return e
+        
+        return await asyncio.gather(*(extract_one(url) for url in urls))
+
+
+def _get_default_client() -> httpx.AsyncClient:
+    """Return the module's shared HTTP client for the running event loop."""
+    global _default_client
+    loop = asyncio.get_running_loop()
+    if _default_client is not None:
+        owner, client = _default_client
+        if owner is loop and not client.is_closed:
+            return client
+        if not client.is_closed:
+            # Left behind by a previous event loop; release its connections
+            _discard_client(owner, client)
+    _default_client = (loop, _make_client(30.0))
+    return _default_client[1]
+
+
+def _discard_client(owner: asyncio.AbstractEventLoop, client: httpx.AsyncClient) -> None:
+    """
+    Close a shared client that belongs to another event loop.
+    
+    A loop still running elsewhere closes the client itself. Otherwise the
+    client is closed from the current loop; its sockets are released even
+    though callbacks on a closed owner loop can no longer be scheduled.
+    """
+    if owner.is_running() and not owner.is_closed():
+        asyncio.run_coroutine_threadsafe(client.aclose(), owner)
+        return
+    
+    task = asyncio.get_running_loop().create_task(_close_stale_client(client))
+    _closing_tasks.add(task)
+    task.add_done_callback(_closing_tasks.discard)
+
+
+async def _close_stale_client(client: httpx.AsyncClient) -> None:
+    """Close a client whose owning event loop may already be closed."""
+    try:
+        await client.aclose()
+    except RuntimeError as e:  # Event loop is closed
+        logger.debug("Stale HTTP client closed with error: %s", e)
+
+
+async def close_default_client() -> None:
+    """Close the shared client used by extract_webpage_content, e.g. on shutdown."""
+    global _default_client
+    if _default_client is not None:
+        owner, client = _default_client
+        _default_client = None
+        if owner is not asyncio.get_running_loop() and owner.is_running():
+            asyncio.run_coroutine_threadsafe(client.aclose(), owner)
+        else:
+            await _close_stale_client(client)
+
+
+def clear_extraction_cache() -> None:
+    """Drop cached extractions, e.g. after pages are known to have changed."""
+    _extract_cache.clear() 
\ No newline at end of file
@@ -7,9 +7,10 @@ error logging, and recovery mechanisms for the web search MCP server.
 
 import logging
 import time
+from collections import deque
 from enum import Enum
-from typing import Any, Dict, Optional, List
-from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, Optional, List
+from datetime import datetime, timedelta, timezone
 
 logger = logging.getLogger(__name__)
 
@@ -44,7 +45,12 @@ class WebSearchError(Exception):
         self.max_results = max_results
         self.backend = backend
         self.context = context or {}
-        self.timestamp = datetime.utcnow()
+        self.timestamp = time.time()  # Epoch seconds; formatted on demand
+    
+    @property
+    def timestamp_iso(self) -> str:
+        """ISO 8601 UTC rendering of when the error was raised."""
+        return datetime.fromtimestamp(self.timestamp, timezone.utc).isoformat()
 
 
 def format_error_message(
@@ -108,12 +114,6 @@ def log_error(
         context: Additional context information
         exception: Original exception if available
     """
-    log_context = {
-        "error_type": error_type.value,
-        "timestamp": datetime.utcnow().isoformat(),
-        **(context or {})
-    }
-    
     # Determine log level based on error type
     if error_type in [ErrorType.SERVER_ERROR, ErrorType.CONFIG_ERROR]:
         log_level = logging.ERROR
@@ -122,8 +122,18 @@ def log_error(
     else:
         log_level = logging.INFO
     
+    # Only build and timestamp the context when the record will be emitted
+    if not logger.isEnabledFor(log_level):
+        return
+    
+    log_context = {
+        "error_type": error_type.value,
+        "timestamp": datetime.utcnow().isoformat(),
+        **(context or {})
+    }
+    
     # Log the error
-    logger.log(log_level, f"{message} - Context: {log_context}", exc_info=exception)
+    logger.log(log_level, "%s - Context: %s", message, log_context, exc_info=exception)
 
 
 def create_validation_error_message(field: str, value: Any, reason: str) -> str:
@@ -199,7 +209,7 @@ def create_server_error_message(error: str, include_support_info: bool = True) -
         suggestions.append("Contact support if the issue continues")
     
     # Log the actual error internally but don't expose it to users
-    logger.error(f"Internal server error: {error}")
+    logger.error("Internal server error: %s", error)
     
     return format_error_message(message, ErrorType.SERVER_ERROR, details, suggestions)
 
@@ -210,23 +220,21 @@ class ErrorRateLimiter:
     def __init__(self, max_errors: int = 5, window_seconds: int = 60):
         self.max_errors = max_errors
         self.window_seconds = window_seconds
-        self.error_counts: Dict[str, List[float]] = {}
+        self.error_counts: Dict[str, Deque[float]] = {}
     
     def record_error(self, error_type: str) -> None:
         """Record an error occurrence."""
-        current_time = time.time()
+        current_time = time.monotonic()  # Window math must not follow wall-clock jumps
         
-        if error_type not in self.error_counts:
-            self.error_counts[error_type] = []
-        
-        # Add current error
-        self.error_counts[error_type].append(current_time)
+        # Add current error; timestamps are appended in order, so the
+        # oldest entries sit at the left end of the window
+        errors = self.error_counts.setdefault(error_type, deque())
+        errors.append(current_time)
         
         # Clean up old errors outside the window
         cutoff_time = current_time - self.window_seconds
-        self.error_counts[error_type] = [
-            t for t in self.error_counts[error_type] if t > cutoff_time
-        ]
+        while errors and errors[0] <= cutoff_time:
+            errors.popleft()
     
     def should_circuit_break(self, error_type: str = None) -> bool:
         """Check if circuit breaker should be triggered."""
@@ -275,7 +283,8 @@ def handle_search_error(
     Returns:
         User-friendly error message
     """
-    error_str = str(error).lower()
+    error_text = str(error)
+    error_str = error_text.lower()
     
     # Determine error type and create appropriate message
     if "timeout" in error_str or "timed out" in error_str:
@@ -292,7 +301,7 @@ def handle_search_error(
             {"query": query, "max_results": max_results, "backend": backend},
             error
         )
-        return create_server_error_message(str(error))
+        return create_server_error_message(error_text)
 
 
 def enhance_error_with_context(
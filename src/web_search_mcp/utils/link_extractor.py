@@ -9,6 +9,12 @@ from urllib.parse import urljoin, urlparse, parse_qs
 
 from bs4 import BeautifulSoup
 
+try:
+    import lxml  # noqa: F401
+    _HTML_PARSER = 'lxml'
+except ImportError:  # pragma: no cover - lxml is a listed requirement
+    _HTML_PARSER = 'html.parser'
+
 
 class LinkCategory(Enum):
     """Categories for extracted links."""
@@ -141,7 +147,7 @@ class LinkExtractor:
         
         try:
             # Parse HTML
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = BeautifulSoup(html_content, _HTML_PARSER)
             
             # Extract base domain
             base_domain = parsed_base.netloc.lower()
@@ -309,8 +309,11 @@ class ContextualLogger:
     def __init__(self, name: str):
         self._logger = logging.getLogger(name)
     
-    def _log_with_context(self, level: int, message: str, context: Optional[Dict[str, Any]] = None, **kwargs):
-        """Log a message with optional context."""
+    def _log_with_context(self, level: int, message: str, args: tuple = (), context: Optional[Dict[str, Any]] = None, **kwargs):
+        """Log a message with optional context; %-style args are formatted lazily."""
+        if not self._logger.isEnabledFor(level):
+            return
+        
         # Create a log record
         record = self._logger.makeRecord(
             self._logger.name,
@@ -318,7 +321,7 @@ class ContextualLogger:
             "",
             0,
             message,
-            (),
+            args,
             None
         )
         
@@ -333,25 +336,25 @@ class ContextualLogger:
         
         self._logger.handle(record)
     
-    def debug(self, message: str, context: Optional[Dict[str, Any]] = None, **kwargs):
+    def debug(self, message: str, *args, context: Optional[Dict[str, Any]] = None, **kwargs):
         """Log a debug message with context."""
-        self._log_with_context(logging.DEBUG, message, context, **kwargs)
+        self._log_with_context(logging.DEBUG, message, args, context, **kwargs)
     
-    def info(self, message: str, context: Optional[Dict[str, Any]] = None, **kwargs):
+    def info(self, message: str, *args, context: Optional[Dict[str, Any]] = None, **kwargs):
         """Log an info message with context."""
-        self._log_with_context(logging.INFO, message, context, **kwargs)
+        self._log_with_context(logging.INFO, message, args, context, **kwargs)
     
-    def warning(self, message: str, context: Optional[Dict[str, Any]] = None, **kwargs):
+    def warning(self, message: str, *args, context: Optional[Dict[str, Any]] = None, **kwargs):
         """Log a warning message with context."""
-        self._log_with_context(logging.WARNING, message, context, **kwargs)
+        self._log_with_context(logging.WARNING, message, args, context, **kwargs)
     
-    def error(self, message: str, context: Optional[Dict[str, Any]] = None, **kwargs):
+    def error(self, message: str, *args, context: Optional[Dict[str, Any]] = None, **kwargs):
         """Log an error message with context."""
-        self._log_with_context(logging.ERROR, message, context, **kwargs)
+        self._log_with_context(logging.ERROR, message, args, context, **kwargs)
     
-    def critical(self, message: str, context: Optional[Dict[str, Any]] = None, **kwargs):
+    def critical(self, message: str, *args, context: Optional[Dict[str, Any]] = None, **kwargs):
         """Log a critical message with context."""
-        self._log_with_context(logging.CRITICAL, message, context, **kwargs)
+        self._log_with_context(logging.CRITICAL, message, args, context, **kwargs)
 
 
 def log_performance(func):
@@ -0,0 +1,111 @@
+"""
+Unit tests for authentication utilities.
+
+Tests that environment-derived auth settings are cached per process
+and refreshed only when the cache is cleared.
+"""
+
+import os
+import pytest
+from unittest.mock import patch
+
+from web_search_mcp.utils.auth import (
+    clear_auth_cache,
+    create_auth_headers,
+    get_api_key,
+    get_bearer_token,
+    load_auth_config,
+    validate_auth_config
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_auth_cache():
+    """Isolate each test from cached auth state."""
+    with patch("web_search_mcp.utils.auth.load_dotenv"):
+        clear_auth_cache()
+        yield
+        clear_auth_cache()
+
+
+class TestAuthConfig:
+    """Test cached authentication configuration loading."""
+
+    def test_load_auth_config_reads_environment_once(self):
+        """Test env changes are ignored until the cache is cleared."""
+        with patch.dict(os.environ, {"API_KEY": "first"}):
+            assert load_auth_config()["api_key"] == "first"
+
+            os.environ["API_KEY"] = "second"
+            assert load_auth_config()["api_key"] == "first"
+
+            clear_auth_cache()
+            assert load_auth_config()["api_key"] == "second"
+
+    def test_load_auth_config_returns_copy(self):
+        """Test callers cannot mutate the cached configuration."""
+        with patch.dict(os.environ, {"API_KEY": "secret"}):
+            load_auth_config()["api_key"] = "changed"
+
+            assert load_auth_config()["api_key"] == "secret"
+
+    def test_validate_auth_config(self):
+        """Test validation against the cached configuration."""
+        with patch.dict(os.environ, {"CLIENT_ID": "client"}, clear=True):
+            assert validate_auth_config(["client_id"]) is True
+            assert validate_auth_config(["client_id", "client_secret"]) is False
+
+
+class TestAuthTokens:
+    """Test API key and header lookups."""
+
+    def test_get_api_key_patterns(self):
+        """Test service keys are found by naming pattern."""
+        with patch.dict(os.environ, {"GITHUB_TOKEN": "gh"}, clear=True):
+            assert get_api_key("github") == "gh"
+            assert get_api_key("openai") is None
+
+    def test_bearer_token_falls_back_to_generic(self):
+        """Test generic bearer and access tokens are used without a service key."""
+        with patch.dict(os.environ, {"ACCESS_TOKEN": "access"}, clear=True):
+            assert get_bearer_token("github") == "access"
+
+    def test_create_auth_headers(self):
+        """Test Authorization headers are built from the resolved token."""
+        with patch.dict(os.environ, {"BEARER_TOKEN": "token"}, clear=True):
+            assert create_auth_headers() == {"Authorization": "Bearer token"}
+            assert create_auth_headers(token_type="Token") == {"Authorization": "Token token"}
+
+        clear_auth_cache()
+        with patch.dict(os.environ, {}, clear=True):
+            assert create_auth_headers() == {}
+
+    def test_keys_from_dotenv_are_found_after_a_miss(self):
+        """Test lookups load .env first and never cache a missing key."""
+        def fake_load_dotenv():
+            os.environ["GITHUB_API_KEY"] = "from-dotenv"
+
+        with patch.dict(os.environ, {}, clear=True):
+            with patch("web_search_mcp.utils.auth.load_dotenv", side_effect=fake_load_dotenv):
+                assert get_api_key("github") == "from-dotenv"
+                assert create_auth_headers("github") == {"Authorization": "Bearer from-dotenv"}
+
+    def test_missing_key_is_not_cached(self):
+        """Test a key set after a failed lookup is returned by the next lookup."""
+        with patch.dict(os.environ, {}, clear=True):
+            assert get_api_key("github") is None
+            assert create_auth_headers("github") == {}
+
+            os.environ["GITHUB_API_KEY"] = "late"
+            assert get_api_key("github") == "late"
+            assert create_auth_headers("github") == {"Authorization": "Bearer late"}
+
+    def test_generic_token_set_after_miss_is_found(self):
+        """Test the generic bearer token fallback does not cache a miss."""
+        with patch.dict(os.environ, {}, clear=True):
+            assert get_bearer_token() is None
+            assert create_auth_headers() == {}
+
+            os.environ["BEARER_TOKEN"] = "late"
+            assert get_bearer_token() == "late"
+            assert create_auth_headers() == {"Authorization": "Bearer late"}
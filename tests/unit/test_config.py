@@ -13,6 +13,7 @@ Tests the comprehensive configuration management that supports:
 import os
 import tempfile
 import pytest
+import yaml
 from pathlib import Path
 from unittest.mock import patch, mock_open
 
@@ -89,6 +90,26 @@ server:
         assert manager.get('server.name') == 'new-name'
         assert manager.get('server.name') != original_name
 
+    def test_config_manager_get_cache(self):
+        """Test cached lookups honour defaults and see later updates."""
+        manager = ConfigManager()
+        
+        assert manager.get('custom.nested.value') is None
+        assert manager.get('custom.nested.value', 'fallback') == 'fallback'
+        
+        manager.set('custom', {'nested': {'value': 1}})
+        assert manager.get('custom.nested.value') == 1
+    
+    def test_config_manager_config_is_a_copy(self):
+        """Test editing the config property cannot stale cached lookups."""
+        manager = ConfigManager()
+        port = manager.get('server.port')
+        
+        manager.config['server']['port'] = port + 1
+        
+        assert manager.get('server.port') == port
+        assert manager.config['server']['port'] == port
+
     def test_config_manager_validate(self):
         """Test ConfigManager validation functionality."""
         manager = ConfigManager()
@@ -174,6 +195,88 @@ invalid_yaml: [unclosed bracket
         assert isinstance(config, dict)
         assert "server" in config  # Should return defaults
 
+    def test_load_config_parses_file_once_per_version(self, tmp_path):
+        """Test repeated loads reuse the parse until the file changes."""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("server:\n  port: 8080\n")
+        
+        with patch("yaml.load", wraps=yaml.load) as mock_load:
+            first = load_config(str(config_file))
+            first["server"]["port"] = 1
+            second = load_config(str(config_file))
+            
+            assert second["server"]["port"] == 8080
+            assert mock_load.call_count == 1
+            
+            config_file.write_text("server:\n  port: 9090\n")
+            stat = config_file.stat()
+            os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            
+            assert load_config(str(config_file))["server"]["port"] == 9090
+            assert mock_load.call_count == 2
+
+    def test_load_config_read_errors_not_cached(self, tmp_path):
+        """Test a transient read failure is retried on the next load."""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("server:\n  port: 6060\n")
+        
+        with patch("yaml.load", side_effect=[OSError("busy"), yaml.safe_load("server:\n  port: 6060\n")]):
+            assert load_config(str(config_file))["server"]["port"] == 8000  # default
+            assert load_config(str(config_file))["server"]["port"] == 6060
+
+    def test_load_config_cache_shared_across_path_spellings(self, tmp_path, monkeypatch):
+        """Test relative and absolute paths to one file share a cached parse."""
+        config_file = tmp_path / "shared.yaml"
+        config_file.write_text("server:\n  port: 7070\n")
+        monkeypatch.chdir(tmp_path)
+        
+        with patch("yaml.load", wraps=yaml.load) as mock_load:
+            assert load_config(str(config_file))["server"]["port"] == 7070
+            assert load_config("shared.yaml")["server"]["port"] == 7070
+            assert mock_load.call_count == 1
+
+    def test_load_config_merges_nested_overrides(self, tmp_path):
+        """Test nested overrides keep sibling defaults at every level."""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(
+            "search:\n  timeout: 5\n"
+            "features: false\n"
+            "custom:\n  nested:\n    value: 1\n"
+        )
+        
+        config = load_config(str(config_file))
+        
+        assert config["search"]["timeout"] == 5
+        assert config["search"]["backend"] == "duckduckgo"
+        assert config["features"] is False
+        assert config["custom"] == {"nested": {"value": 1}}
+        assert config["server"]["name"] == "web-search-mcp-server"
+
+    def test_merge_with_defaults_leaves_input_untouched(self):
+        """Test the iterative merge does not mutate the loaded config."""
+        from web_search_mcp.utils.config import _merge_with_defaults
+        
+        loaded = {"search": {"timeout": 5}, "extra": {"a": {"b": 1}}}
+        
+        first = _merge_with_defaults(loaded)
+        first["search"]["backend"] = "changed"
+        second = _merge_with_defaults(loaded)
+        
+        assert loaded == {"search": {"timeout": 5}, "extra": {"a": {"b": 1}}}
+        assert second["search"]["backend"] == "duckduckgo"
+        assert second["search"]["timeout"] == 5
+
+    def test_default_config_returns_independent_copies(self):
+        """Test callers may mutate defaults without affecting later loads."""
+        from web_search_mcp.utils.config import _default_config
+        
+        first = _default_config()
+        first["server"]["port"] = 1
+        first["features"]["enable_auth"] = True
+        
+        assert _default_config()["server"]["port"] == 8000
+        assert load_config("definitely-missing.yaml")["features"]["enable_auth"] is False
+
     @patch('builtins.open', mock_open(read_data=""))
     @patch('os.path.exists', return_value=True)
     def test_load_config_empty_file(self, mock_exists):
@@ -216,6 +319,42 @@ class TestEnvironmentVariables:
             assert isinstance(get_env_var('TEST_BOOL_TRUE'), str)
             assert isinstance(get_env_var('TEST_STRING'), str)
 
+    def test_environment_overrides_applied(self):
+        """Test WEB_SEARCH_ variables override configuration values."""
+        with patch.dict(os.environ, {
+            'WEB_SEARCH_SERVER_PORT': '9090',
+            'WEB_SEARCH_SERVER_DEBUG': 'TRUE',
+            'UNRELATED_SERVER_PORT': '1',
+        }):
+            manager = ConfigManager()
+        
+        assert manager.get('server.port') == 9090
+        assert manager.get('server.debug') is True
+
+    def test_convert_env_value_types(self):
+        """Test environment strings are converted without parsing non-numbers."""
+        manager = ConfigManager()
+        
+        assert manager._convert_env_value('42') == 42
+        assert manager._convert_env_value('-7') == -7
+        assert manager._convert_env_value('3.5') == 3.5
+        assert manager._convert_env_value('1e3') == 1000.0
+        assert manager._convert_env_value('False') is False
+        assert manager._convert_env_value('localhost') == 'localhost'
+        assert manager._convert_env_value('1.2.3') == '1.2.3'
+        assert manager._convert_env_value('') == ''
+
+    def test_set_creates_and_replaces_intermediate_levels(self):
+        """Test set builds missing levels and replaces scalars in the way."""
+        manager = ConfigManager()
+        
+        manager.set('new.section.value', 1)
+        manager.set('server.port.internal', 2)
+        
+        assert manager.get('new.section.value') == 1
+        assert manager.get('server.port') == {'internal': 2}
+        assert manager.get('server.host') == 'localhost'
+
 
 class TestConfigValidation:
     """Test configuration validation."""
@@ -319,6 +458,12 @@ class TestDotNotationAccess:
         assert get_config_value(config, "server.nonexistent") is None
         assert get_config_value(config, "nonexistent.host") is None
 
+    def test_get_config_value_through_scalar(self):
+        """Test paths running through non-dict values fall back to default."""
+        config = {"server": {"host": "localhost", "proxy": None}}
+        assert get_config_value(config, "server.host.name", "default") == "default"
+        assert get_config_value(config, "server.proxy", "default") is None
+
 
 class TestConfigurationIntegration:
     """Test configuration system integration."""
@@ -339,4 +339,200 @@ class TestContentCleaner:
         assert "multiple     spaces" not in result.cleaned_text
         assert "multiple spaces" in result.cleaned_text
         # Should handle multiple newlines properly
-        assert result.cleaned_text.count('\n\n\n') == 0 
\ No newline at end of file
+        assert result.cleaned_text.count('\n\n\n') == 0 
+    
+    def test_normalize_whitespace_collapses_runs(self):
+        """Test inline whitespace runs and blank-line runs are collapsed."""
+        text = "  a \t\t b\n\n \n\nc  "
+        
+        assert self.cleaner._normalize_whitespace(text) == "a b\n\nc"
+
+    def test_text_excludes_style_and_doctype(self):
+        """Test text comes from the cleaned tree without markup-only strings."""
+        html = (
+            "<!DOCTYPE html><html><head><style>.a{color:red}</style></head>"
+            "<body><p>Visible</p><form>Form text</form><noscript>fallback</noscript></body></html>"
+        )
+        result = self.cleaner.clean_content(html, CleaningProfile.MINIMAL)
+        
+        assert result.cleaned_text == "Visible Form text fallback"
+        assert "color" not in result.cleaned_text
+
+    def test_fragment_cleaning_with_lxml_parser(self):
+        """Test HTML fragments clean to their content without document wrappers."""
+        result = self.cleaner.clean_content("<p>Just a fragment</p>", CleaningProfile.MINIMAL)
+        
+        assert result.cleaned_html == "<p>Just a fragment</p>"
+        assert result.cleaned_text == "Just a fragment"
+
+    def test_nested_ad_matches_removed_once(self):
+        """Test nested ad matches are removed with their container and labelled."""
+        html = """
+        <div class="ad-container"><div class="ad">Inner ad</div></div>
+        <div class="sponsored">Sponsored</div>
+        <p>Keep me</p>
+        """
+        result = self.cleaner.clean_content(
+            html, CleaningProfile.STANDARD, custom_remove_selectors=["p.remove-me"]
+        )
+        
+        assert result.cleaned_text == "Keep me"
+        assert {"ad-container", "ad", "sponsored"} <= set(result.removed_elements)
+        assert not any(label.startswith("custom_") for label in result.removed_elements)
+
+    def test_comments_removed_without_touching_text(self):
+        """Test HTML comments are stripped while surrounding text is kept."""
+        html = "<div><p>Before<!-- hidden note -->After</p><!-- <b>markup</b> --></div>"
+        result = self.cleaner.clean_content(html, CleaningProfile.MINIMAL)
+        
+        assert "hidden note" not in result.cleaned_html
+        assert "markup" not in result.cleaned_text
+        assert "Before" in result.cleaned_text
+        assert "After" in result.cleaned_text
+
+    def test_removed_elements_and_issues_are_unique(self):
+        """Test repeated removals and issues are reported once each."""
+        html = (
+            '<p onclick="a()">One</p><p onclick="b()">Two</p>'
+            '<script>x()</script><script>y()</script>'
+        )
+        result = self.cleaner.clean_content(html, CleaningProfile.MINIMAL)
+        
+        assert isinstance(result.removed_elements, list)
+        assert result.removed_elements.count("script") == 1
+        assert result.security_issues.count("xss_event_handler") == 1
+
+    def test_single_pass_sanitizes_nested_and_mixed_case(self):
+        """Test dangerous tags, handlers and javascript: URLs go in one walk."""
+        html = (
+            '<div><iframe src="x"><script>evil()</script></iframe>'
+            '<a href=" JavaScript:alert(1)" ONCLICK="x()">Link</a>'
+            '<img src="ok.png" alt="Pic"></div>'
+        )
+        result = self.cleaner.clean_content(html, CleaningProfile.MINIMAL)
+        
+        assert "iframe" in result.removed_elements
+        assert "evil" not in result.cleaned_html
+        assert "javascript" not in result.cleaned_html.lower()
+        assert "onclick" not in result.cleaned_html.lower()
+        assert 'src="ok.png"' in result.cleaned_html
+        assert {"dangerous_element", "xss_event_handler", "xss_javascript_url"} <= set(result.security_issues)
+
+    def test_tag_and_attribute_tables_are_frozensets(self):
+        """Test membership tables are immutable sets shared by all instances."""
+        assert isinstance(ContentCleaner.DANGEROUS_TAGS, frozenset)
+        assert isinstance(ContentCleaner.DANGEROUS_ATTRIBUTES, frozenset)
+        assert isinstance(ContentCleaner.ALLOWED_TAGS, frozenset)
+        assert "onerror" in ContentCleaner.DANGEROUS_ATTRIBUTES
+
+    def test_repeat_content_served_from_cache(self):
+        """Test identical content is cleaned once and returned as a fresh copy."""
+        html = '<div class="ad">Ad</div><p>Body text</p>'
+        
+        with patch('src.web_search_mcp.utils.content_cleaner.BeautifulSoup', wraps=BeautifulSoup) as mock_soup:
+            first = self.cleaner.clean_content(html, CleaningProfile.STANDARD)
+            first.removed_elements.append("mutated")
+            second = self.cleaner.clean_content(html, CleaningProfile.STANDARD)
+            self.cleaner.clean_content(html, CleaningProfile.MINIMAL)
+            self.cleaner.clean_content(html, CleaningProfile.STANDARD, custom_remove_selectors=["p"])
+        
+        assert mock_soup.call_count == 3
+        assert second.cleaned_text == first.cleaned_text
+        assert "mutated" not in second.removed_elements
+        assert second is not first
+
+    def test_cache_evicts_least_recently_used(self):
+        """Test the result cache stays within its configured size."""
+        cleaner = ContentCleaner(cache_size=2)
+        
+        for index in range(3):
+            cleaner.clean_content(f"<p>Page {index}</p>", CleaningProfile.MINIMAL)
+        
+        assert len(cleaner._cache) == 2
+
+    def test_text_extraction_includes_alt_text_in_order(self):
+        """Test page text is followed by image alt text, skipping style contents."""
+        html = (
+            '<style>p{margin:0}</style><p> First </p><img src="a.png" alt=" Chart ">'
+            '<p>Second</p><img src="b.png" alt="">'
+        )
+        result = self.cleaner.clean_content(html, CleaningProfile.MINIMAL)
+        
+        assert result.cleaned_text == "First Second Chart"
+
+    def test_academic_navigation_keeps_preserved_matches(self):
+        """Test navigation matches that are academic elements survive the single select."""
+        html = (
+            '<nav>Site nav</nav><aside class="footnotes">Footnote text</aside>'
+            '<div class="sidebar">Sidebar</div><p>Body</p>'
+        )
+        result = self.cleaner.clean_content(html, CleaningProfile.ACADEMIC)
+        
+        assert result.cleaned_text == "Footnote text Body"
+        assert {"nav", "sidebar"} <= set(result.removed_elements)
+        assert "aside" not in result.removed_elements
+
+    def test_nested_matches_decomposed_top_down_once(self):
+        """Test only outermost matches are decomposed; nested ones are skipped."""
+        from bs4.element import Tag
+        
+        html = '<div class="ads"><div class="ad"><div class="ad-banner">x</div></div></div><p>Keep</p>'
+        
+        with patch.object(Tag, 'decompose', autospec=True, side_effect=Tag.decompose) as mock_decompose:
+            result = self.cleaner.clean_content(html, CleaningProfile.STANDARD)
+        
+        assert mock_decompose.call_count == 1
+        assert result.cleaned_text == "Keep"
+        assert {"ads", "ad", "ad-banner"} <= set(result.removed_elements)
+
+    def test_allowlist_serialization_without_bleach(self):
+        """Test disallowed tags, attributes and URL schemes are stripped from the tree."""
+        html = (
+            '<!DOCTYPE html><section id="s"><p class="x">Text <br>'
+            '<a href="ftp://files" title="t">FTP</a> <a href="/docs">Docs</a>'
+            '<img src="pic.png" alt="Pic" onload="x()"></p></section>'
+        )
+        
+        with patch('src.web_search_mcp.utils.content_cleaner._import_bleach') as mock_bleach:
+            result = self.cleaner.clean_content(html, CleaningProfile.MINIMAL)
+        
+        mock_bleach.assert_not_called()
+        assert result.cleaned_html == (
+            '<p>Text <br><a title="t">FTP</a> <a href="/docs">Docs</a>'
+            '<img alt="Pic" src="pic.png"></p>'
+        )
+
+    def test_strict_mode_runs_bleach(self):
+        """Test strict cleaning adds the bleach pass on top of the allowlist."""
+        cleaner = ContentCleaner(strict=True)
+        
+        with patch('src.web_search_mcp.utils.content_cleaner._import_bleach') as mock_bleach:
+            mock_bleach.return_value.clean.return_value = "<p>bleached</p>"
+            result = cleaner.clean_content("<p>Text</p>", CleaningProfile.MINIMAL)
+        
+        mock_bleach.return_value.clean.assert_called_once()
+        assert result.cleaned_html == "<p>bleached</p>"
+
+    def test_normalize_whitespace_long_mixed_runs(self):
+        """Test long runs of mixed spaces and tabs collapse to one space."""
+        text = "a" + " \t" * 50 + "b\t\tc"
+        
+        assert self.cleaner._normalize_whitespace(text) == "a b c"
+
+    def test_whitespace_only_content_skips_parsing(self):
+        """Test blank content returns an empty result without building a soup."""
+        with patch('src.web_search_mcp.utils.content_cleaner.BeautifulSoup') as mock_soup:
+            result = self.cleaner.clean_content(" \n\t ", CleaningProfile.AGGRESSIVE)
+        
+        mock_soup.assert_not_called()
+        assert result.cleaned_html == ""
+        assert result.word_count == 0
+        assert result.cleaning_profile == CleaningProfile.AGGRESSIVE
+
+    def test_bytes_content_decoded_as_utf8(self):
+        """Test byte input is decoded once and invalid input types are rejected."""
+        result = self.cleaner.clean_content("<p>Café</p>".encode("utf-8"), CleaningProfile.MINIMAL)
+        
+        assert result.cleaned_text == "Café"
+        with pytest.raises(CleaningError):
+            self.cleaner.clean_content(123, CleaningProfile.MINIMAL)
@@ -15,13 +15,39 @@ from src.web_search_mcp.utils.content_extractor import (
     ExtractedContent,
     ContentExtractionError,
     extract_webpage_content,
+    extract_many,
+    clear_extraction_cache,
     create_content_summary,
     extract_text_from_html,
     clean_extracted_text,
+    clean_and_summarize,
     create_mcp_content_resource
 )
 
 
+class _StreamContext:
+    """Async context manager standing in for AsyncClient.stream()."""
+    
+    def __init__(self, response):
+        self.response = response
+    
+    async def __aenter__(self):
+        return self.response
+    
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+def streaming(response):
+    """Serve a mocked response's text through AsyncClient.stream."""
+    async def aiter_bytes(chunk_size=None):
+        yield response.text.encode("utf-8")
+    
+    response.aiter_bytes = aiter_bytes
+    response.encoding = "utf-8"
+    return lambda *args, **kwargs: _StreamContext(response)
+
+
 class TestExtractedContent:
     """Test cases for ExtractedContent data class."""
     
@@ -62,6 +88,16 @@ class TestExtractedContent:
         assert content_dict["text"] == "Content"
         assert content_dict["summary"] == "Summary"
     
+    def test_extracted_content_to_dict_copies_metadata(self):
+        """Test the returned metadata can be edited without touching the content."""
+        content = ExtractedContent(url="u", title="t", text="a b", summary="s", metadata={"k": "v"})
+        
+        content_dict = content.to_dict()
+        content_dict["metadata"]["k"] = "changed"
+        
+        assert content.metadata["k"] == "v"
+        assert content_dict["word_count"] == 2
+    
     def test_extracted_content_word_count(self):
         """Test automatic word count calculation."""
         content = ExtractedContent(
@@ -72,6 +108,14 @@ class TestExtractedContent:
         )
         
         assert content.word_count == 9  # "This is a test with multiple words in it."
+    
+    def test_extracted_content_word_count_computed_once(self):
+        """Test word count is stored at creation rather than re-split per access."""
+        content = ExtractedContent(url="u", title="t", text="one two three", summary="s")
+        
+        assert vars(content)["word_count"] == 3
+        assert content.metadata["word_count"] == 3
+        assert ExtractedContent(url="u", title="t", text="", summary="s").word_count == 0
 
 
 class TestContentExtractor:
@@ -97,13 +141,13 @@ class TestContentExtractor:
         </html>
         """
         
-        with patch('httpx.AsyncClient.get') as mock_get:
+        with patch('httpx.AsyncClient.stream') as mock_stream:
             mock_response = Mock()
             mock_response.text = mock_html
             mock_response.status_code = 200
             mock_response.headers = {"content-type": "text/html"}
             mock_response.raise_for_status = Mock()
-            mock_get.return_value = mock_response
+            mock_stream.side_effect = streaming(mock_response)
             
             content = await extractor.extract_content("https://example.com")
             
@@ -117,8 +161,8 @@ class TestContentExtractor:
     @pytest.mark.asyncio
     async def test_extract_content_network_error(self, extractor):
         """Test content extraction with network error."""
-        with patch('httpx.AsyncClient.get') as mock_get:
-            mock_get.side_effect = httpx.RequestError("Network error")
+        with patch('httpx.AsyncClient.stream') as mock_stream:
+            mock_stream.side_effect = httpx.RequestError("Network error")
             
             with pytest.raises(ContentExtractionError, match="Failed to fetch content"):
                 await extractor.extract_content("https://example.com")
@@ -126,13 +170,13 @@ class TestContentExtractor:
     @pytest.mark.asyncio
     async def test_extract_content_http_error(self, extractor):
         """Test content extraction with HTTP error."""
-        with patch('httpx.AsyncClient.get') as mock_get:
+        with patch('httpx.AsyncClient.stream') as mock_stream:
             mock_response = Mock()
             mock_response.status_code = 404
             mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
                 "Not Found", request=Mock(), response=mock_response
             )
-            mock_get.return_value = mock_response
+            mock_stream.side_effect = streaming(mock_response)
             
             with pytest.raises(ContentExtractionError, match="HTTP error"):
                 await extractor.extract_content("https://example.com")
@@ -140,19 +184,93 @@ class TestContentExtractor:
     @pytest.mark.asyncio
     async def test_extract_content_invalid_html(self, extractor):
         """Test content extraction with invalid HTML."""
-        with patch('httpx.AsyncClient.get') as mock_get:
+        with patch('httpx.AsyncClient.stream') as mock_stream:
             mock_response = Mock()
             mock_response.text = "<html><body><p>Unclosed paragraph"
             mock_response.status_code = 200
             mock_response.headers = {"content-type": "text/html"}
             mock_response.raise_for_status = Mock()
-            mock_get.return_value = mock_response
+            mock_stream.side_effect = streaming(mock_response)
             
             # Should still work with malformed HTML
             content = await extractor.extract_content("https://example.com")
             assert content.url == "https://example.com"
             assert "Unclosed paragraph" in content.text
     
+    @pytest.mark.asyncio
+    async def test_extract_content_reuses_client_in_context(self):
+        """Test one HTTP client serves every extraction inside the context."""
+        mock_response = Mock()
+        mock_response.text = "<html><head><title>Reuse</title></head><body><p>Shared client</p></body></html>"
+        mock_response.status_code = 200
+        mock_response.headers = {"content-type": "text/html"}
+        mock_response.raise_for_status = Mock()
+        
+        with patch('httpx.AsyncClient.stream', side_effect=streaming(mock_response)), \
+                patch('httpx.AsyncClient.aclose', AsyncMock()) as mock_close:
+            async with ContentExtractor() as extractor:
+                client = extractor._client
+                await extractor.extract_content("https://example.com/1")
+                await extractor.extract_content("https://example.com/2")
+                assert extractor._client is client
+            
+            mock_close.assert_awaited_once()
+            assert extractor._client is None
+    
+    @pytest.mark.asyncio
+    async def test_extract_content_stops_streaming_at_byte_budget(self):
+        """Test the body download stops once the byte budget is reached."""
+        extractor = ContentExtractor(max_content_length=10)  # 200 byte budget
+        chunks_read = 0
+        
+        async def aiter_bytes(chunk_size=None):
+            nonlocal chunks_read
+            yield b"<html><head><title>Big</title></head><body><p>" + "\u00e9".encode("utf-8") * 40
+            for _ in range(100):
+                chunks_read += 1
+                yield b"x" * 100
+        
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.headers = {"content-type": "text/html"}
+        mock_response.raise_for_status = Mock()
+        mock_response.aiter_bytes = aiter_bytes
+        mock_response.encoding = "utf-8"
+        
+        with patch('httpx.AsyncClient.stream', side_effect=lambda *a, **k: _StreamContext(mock_response)):
+            content = await extractor.extract_content("https://example.com/big")
+        
+        assert chunks_read == 1
+        assert content.title == "Big"
+        assert content.text.startswith("\u00e9" * 10)
+    
+    @pytest.mark.asyncio
+    async def test_extract_content_rejects_non_html_before_reading(self, extractor):
+        """Test non-HTML responses fail without their body being read."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.headers = {"content-type": "application/pdf"}
+        mock_response.raise_for_status = Mock()
+        mock_response.aiter_bytes = Mock(side_effect=AssertionError("body read"))
+        
+        with patch('httpx.AsyncClient.stream', side_effect=lambda *a, **k: _StreamContext(mock_response)):
+            with pytest.raises(ContentExtractionError, match="Unsupported content-type: application/pdf"):
+                await extractor.extract_content("https://example.com/file.pdf")
+    
+    @pytest.mark.asyncio
+    async def test_extract_content_accepts_xhtml_with_charset(self, extractor):
+        """Test XHTML content types with parameters are still extracted."""
+        mock_response = Mock()
+        mock_response.text = "<html><head><title>XHTML</title></head><body><p>Strict page</p></body></html>"
+        mock_response.status_code = 200
+        mock_response.headers = {"content-type": "application/xhtml+xml; charset=utf-8"}
+        mock_response.raise_for_status = Mock()
+        
+        with patch('httpx.AsyncClient.stream', side_effect=streaming(mock_response)):
+            content = await extractor.extract_content("https://example.com/page.xhtml")
+        
+        assert content.title == "XHTML"
+    
     def test_extract_content_timeout_config(self):
         """Test ContentExtractor with custom timeout."""
         extractor = ContentExtractor(timeout=60.0)
@@ -228,6 +346,81 @@ class TestTextExtraction:
         assert "color: red" not in text
         assert "more_script" not in text
     
+    def test_extract_text_from_html_bytes_with_encoding(self):
+        """Test byte content is decoded with the given encoding."""
+        html = "<html><head><title>Caf\u00e9</title></head><body><p>D\u00e9j\u00e0 vu</p></body></html>"
+        
+        title, text = extract_text_from_html(html.encode("latin-1"), encoding="latin-1")
+        
+        assert title == "Caf\u00e9"
+        assert "D\u00e9j\u00e0 vu" in text
+    
+    def test_extract_text_from_html_falls_back_without_lxml(self):
+        """Test html.parser is used when lxml is unavailable."""
+        from bs4 import BeautifulSoup, FeatureNotFound
+        
+        def fake_soup(markup, features, **kwargs):
+            if features == 'lxml':
+                raise FeatureNotFound(features)
+            return BeautifulSoup(markup, features, **kwargs)
+        
+        with patch('src.web_search_mcp.utils.content_extractor.LexborHTMLParser', None), \
+             patch('src.web_search_mcp.utils.content_extractor.BeautifulSoup', side_effect=fake_soup) as mock_soup:
+            title, text = extract_text_from_html("<title>T</title><p>Fallback text</p>")
+        
+        assert [call.args[1] for call in mock_soup.call_args_list] == ['lxml', 'html.parser']
+        assert title == "T"
+        assert "Fallback text" in text
+    
+    def test_extract_text_from_html_without_selectolax(self):
+        """Test BeautifulSoup extraction is used when selectolax is missing."""
+        html = "<html><head><title>Soup</title></head><body><nav>Menu</nav><p>Body text</p></body></html>"
+        
+        with patch('src.web_search_mcp.utils.content_extractor.LexborHTMLParser', None):
+            title, text = extract_text_from_html(html)
+        
+        assert title == "Soup"
+        assert text == "Body text"
+    
+    def test_soup_extraction_strips_nested_boilerplate_and_comments(self):
+        """Test one walk removes nested boilerplate and comments everywhere."""
+        from src.web_search_mcp.utils.content_extractor import _extract_text_soup
+        
+        html = (
+            "<html><body><header><nav>Menu<!-- in nav --></nav></header>"
+            "<article><p>Kept <!-- hidden -->paragraph</p><aside><script>x()</script>Side</aside></article>"
+            "</body></html>"
+        )
+        
+        title, text = _extract_text_soup(html)
+        
+        assert text == "Kept paragraph"
+    
+    def test_nested_container_text_extracted_once(self):
+        """Test text in nested divs and sections appears once, in order."""
+        html = (
+            "<html><body><div>Intro text<div><section><p>Deep <b>bold</b> paragraph</p></section></div>"
+            "Closing words</div></body></html>"
+        )
+        
+        title, text = extract_text_from_html(html)
+        
+        assert text == "Intro text\n\nDeep bold paragraph\n\nClosing words"
+    
+    def test_lexbor_and_soup_extraction_agree(self):
+        """Test the selectolax fast path matches the BeautifulSoup path."""
+        pytest.importorskip("selectolax")
+        from src.web_search_mcp.utils.content_extractor import _extract_text_lexbor, _extract_text_soup
+        
+        html = """
+        <html><head><title> Parity </title><style>p {}</style></head>
+        <body><header><nav>Nav</nav></header>
+        <div role="main"><h1>Heading</h1><section>Section text <p>Nested para</p></section>
+        <!-- comment --><aside>Aside</aside></div></body></html>
+        """
+        
+        assert _extract_text_lexbor(html) == _extract_text_soup(html)
+    
     def test_clean_extracted_text(self):
         """Test text cleaning functionality."""
         dirty_text = """
@@ -248,6 +441,22 @@ class TestTextExtraction:
         assert "\n\n\n" not in cleaned
         assert "\t" not in cleaned
         assert cleaned.strip() == cleaned  # No leading/trailing whitespace
+    
+    def test_clean_extracted_text_collapses_all_whitespace(self):
+        """Test tabs, newlines and space runs collapse to single spaces."""
+        text = "  First\tline\n\n\n  second   line [menu] ..... ------ \x0b end \n"
+        
+        assert clean_extracted_text(text) == "First line second line ... --- end"
+    
+    def test_clean_and_summarize_truncates_and_summarizes(self):
+        """Test that the fused helper caps content and summarizes it."""
+        text = "First sentence here.\n\n" + "word " * 200
+        
+        content, summary = clean_and_summarize(text, max_content_length=100, summary_length=50)
+        
+        assert content.endswith("...")
+        assert len(content) == 103
+        assert summary == create_content_summary(content, max_length=50)
 
 
 class TestContentSummarization:
@@ -297,6 +506,16 @@ class TestContentSummarization:
         # Should cut at sentence boundary, not mid-sentence
         assert summary.endswith("...") or summary.endswith(".")
         assert "First sentence." in summary
+    
+    def test_create_content_summary_ignores_early_sentence_boundary(self):
+        """Test that a sentence end in the first 70% falls back to a word cut."""
+        text = "Short. " + "word " * 40
+        
+        summary = create_content_summary(text, max_length=50)
+        
+        assert summary.endswith("...")
+        assert len(summary) > 40
+        assert summary.startswith("Short. word")
 
 
 class TestMCPContentResource:
@@ -350,6 +569,36 @@ class TestMCPContentResource:
         assert content_metadata["publish_date"] == "2025-06-20"
         assert content_metadata["category"] == "technology"
         assert content_metadata["query"] == "technology news"
+    
+    def test_create_mcp_content_resource_reuses_extraction_time(self):
+        """Test that the resource timestamp reuses the extraction time."""
+        extracted_content = ExtractedContent(
+            url="https://example.com",
+            title="Title",
+            text="Body text.",
+            summary="Summary."
+        )
+        
+        mcp_resource = create_mcp_content_resource(extracted_content, index=1)
+        
+        content_metadata = mcp_resource["content"]["metadata"]
+        assert content_metadata["timestamp"] == content_metadata["extraction_time"]
+    
+    def test_create_mcp_content_resource_explicit_now(self):
+        """Test that an explicit timestamp is used when provided."""
+        from datetime import datetime, timezone
+        
+        extracted_content = ExtractedContent(
+            url="https://example.com",
+            title="Title",
+            text="Body text.",
+            summary="Summary."
+        )
+        now = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        
+        mcp_resource = create_mcp_content_resource(extracted_content, index=1, now=now)
+        
+        assert mcp_resource["content"]["metadata"]["timestamp"] == now.isoformat()
 
 
 class TestContentExtractionIntegration:
@@ -428,6 +677,13 @@ class TestContentExtractionError:
 class TestContentExtractionStandalone:
     """Test cases for standalone content extraction functions."""
     
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        """Start and finish each test with an empty extraction cache."""
+        clear_extraction_cache()
+        yield
+        clear_extraction_cache()
+    
     @pytest.mark.asyncio
     async def test_extract_webpage_content_function(self):
         """Test standalone webpage content extraction function."""
@@ -438,16 +694,110 @@ class TestContentExtractionStandalone:
         </html>
         """
         
-        with patch('httpx.AsyncClient.get') as mock_get:
+        with patch('httpx.AsyncClient.stream') as mock_stream:
             mock_response = Mock()
             mock_response.text = mock_html
             mock_response.status_code = 200
             mock_response.headers = {"content-type": "text/html"}
             mock_response.raise_for_status = Mock()
-            mock_get.return_value = mock_response
+            mock_stream.side_effect = streaming(mock_response)
             
             content = await extract_webpage_content("https://example.com")
             
             assert content.url == "https://example.com"
             assert content.title == "Standalone Test"
-            assert "Content for standalone function test." in content.text 
\ No newline at end of file
+            assert "Content for standalone function test." in content.text 
+    
+    @pytest.mark.asyncio
+    async def test_extract_webpage_content_cached_and_shared(self):
+        """Test repeat and concurrent calls for one URL share a single fetch."""
+        import asyncio
+        
+        calls = 0
+        
+        async def fake_extract(self, url):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0)
+            return ExtractedContent(url=url, title="Cached", text="Body", summary="Body")
+        
+        with patch.object(ContentExtractor, 'extract_content', fake_extract):
+            first, second = await asyncio.gather(
+                extract_webpage_content("https://example.com/a"),
+                extract_webpage_content("https://example.com/a"),
+            )
+            third = await extract_webpage_content("https://example.com/a")
+            await extract_webpage_content("https://example.com/b")
+        
+        assert calls == 2
+        assert first is second is third
+    
+    def test_default_client_closed_when_event_loop_changes(self):
+        """Test the shared client from a previous loop is closed, not leaked."""
+        import asyncio
+        from src.web_search_mcp.utils import content_extractor
+        
+        async def get_client():
+            return content_extractor._get_default_client()
+        
+        async def replace_client():
+            client = content_extractor._get_default_client()
+            # Let the stale client's close task run
+            for _ in range(3):
+                await asyncio.sleep(0)
+            return client
+        
+        async def close_client():
+            await content_extractor.close_default_client()
+        
+        first = asyncio.run(get_client())
+        second = asyncio.run(replace_client())
+        
+        assert second is not first
+        assert first.is_closed
+        assert not second.is_closed
+        
+        asyncio.run(close_client())
+        
+        assert second.is_closed
+        assert content_extractor._default_client is None
+    
+    @pytest.mark.asyncio
+    async def test_extract_webpage_content_errors_not_cached(self):
+        """Test failed extractions are retried on the next call."""
+        with patch.object(ContentExtractor, 'extract_content', AsyncMock(
+            side_effect=[ContentExtractionError("boom"), ExtractedContent(url="u", title="t", text="x", summary="x")]
+        )) as mock_extract:
+            with pytest.raises(ContentExtractionError):
+                await extract_webpage_content("https://example.com/flaky")
+            content = await extract_webpage_content("https://example.com/flaky")
+        
+        assert content.title == "t"
+        assert mock_extract.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_extract_many_overlaps_and_keeps_order(self):
+        """Test batch extraction respects the limit and returns per-URL errors."""
+        import asyncio
+        
+        active = 0
+        peak = 0
+        
+        async def fake_extract(self, url):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            if url.endswith("bad"):
+                raise ContentExtractionError("failed", url=url)
+            return ExtractedContent(url=url, title=url, text="x", summary="x")
+        
+        urls = [f"https://example.com/{i}" for i in range(5)] + ["https://example.com/bad"]
+        with patch.object(ContentExtractor, 'extract_content', fake_extract):
+            results = await extract_many(urls, concurrency=2)
+        
+        assert peak == 2
+        assert [r.url for r in results] == urls
+        assert isinstance(results[-1], ContentExtractionError)
+        assert isinstance(results[0], ExtractedContent)
@@ -69,6 +69,29 @@ class TestErrorHandlingFramework:
         assert error.backend == "duckduckgo"
         assert error.error_type == "SEARCH_ERROR"
 
+    def test_error_timestamp_formatted_on_demand(self):
+        """Test that the error timestamp is stored raw and rendered as UTC ISO 8601."""
+        from datetime import datetime
+        from web_search_mcp.utils.error_handling import WebSearchError
+        
+        with patch('web_search_mcp.utils.error_handling.time.time', return_value=0.0):
+            error = WebSearchError(message="Search failed", error_type="SEARCH_ERROR")
+        
+        assert error.timestamp == 0.0
+        assert error.timestamp_iso == "1970-01-01T00:00:00+00:00"
+        assert datetime.fromisoformat(error.timestamp_iso).tzinfo is not None
+
+    def test_log_error_skips_disabled_levels(self):
+        """Test that log_error does no work when its level is disabled."""
+        from web_search_mcp.utils.error_handling import log_error, ErrorType
+        
+        with patch('web_search_mcp.utils.error_handling.logger') as mock_logger:
+            mock_logger.isEnabledFor.return_value = False
+            log_error("Invalid input", ErrorType.VALIDATION_ERROR, {"query": "test"})
+            
+            mock_logger.isEnabledFor.assert_called_once_with(logging.WARNING)
+            mock_logger.log.assert_not_called()
+
     def test_error_logging_integration(self):
         """Test that errors are properly logged with appropriate levels."""
         from web_search_mcp.utils.error_handling import log_error, ErrorType
@@ -279,6 +302,24 @@ class TestErrorRecoveryMechanisms:
         # Should trigger circuit breaker
         assert rate_limiter.should_circuit_break() is True
 
+    def test_error_rate_limiter_drops_errors_outside_window(self):
+        """Test that errors older than the window no longer count."""
+        from web_search_mcp.utils.error_handling import ErrorRateLimiter
+        
+        rate_limiter = ErrorRateLimiter(max_errors=3, window_seconds=60)
+        
+        with patch('web_search_mcp.utils.error_handling.time.monotonic') as mock_time:
+            for timestamp in (0.0, 10.0, 20.0):
+                mock_time.return_value = timestamp
+                rate_limiter.record_error("SEARCH_ERROR")
+            assert rate_limiter.should_circuit_break("SEARCH_ERROR") is True
+            
+            mock_time.return_value = 75.0
+            rate_limiter.record_error("SEARCH_ERROR")
+        
+        assert list(rate_limiter.error_counts["SEARCH_ERROR"]) == [20.0, 75.0]
+        assert rate_limiter.should_circuit_break("SEARCH_ERROR") is False
+
     def test_retry_mechanism_with_exponential_backoff(self):
         """Test retry mechanism with exponential backoff."""
         from web_search_mcp.utils.error_handling import RetryMechanism
@@ -430,4 +430,16 @@ class TestLinkExtractor:
         result = self.extractor.extract_links(malformed_html, self.base_url)
         
         assert result.total_count >= 0  # Should not crash
-        assert isinstance(result.processing_time, float) 
\ No newline at end of file
+        assert isinstance(result.processing_time, float) 
+    def test_links_without_closing_tags_are_extracted(self):
+        """Test that every link in loosely nested markup is still found."""
+        html = (
+            '<p><a href="/one">One<p><a href="https://other.org/two">Two'
+            '<table><tr><td><a href="/three">Three</table>'
+        )
+        result = self.extractor.extract_links(html, self.base_url)
+        
+        urls = {link.url for link in result.links}
+        assert "https://example.com/one" in urls
+        assert "https://other.org/two" in urls
+        assert "https://example.com/three" in urls
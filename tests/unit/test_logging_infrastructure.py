@@ -184,6 +184,11 @@ class TestLoggingSetup:
 class TestContextualLogging:
     """Test contextual logging features."""
 
+    @pytest.fixture(autouse=True)
+    def enable_all_levels(self, caplog):
+        """ContextualLogger skips disabled levels, so let every level through."""
+        caplog.set_level(logging.DEBUG)
+
     def test_request_context_logging(self):
         """Test logging with request context."""
         from web_search_mcp.utils.logging_config import ContextualLogger
@@ -227,6 +232,38 @@ class TestContextualLogging:
             assert hasattr(call_args, 'correlation_id')
             assert call_args.correlation_id == test_id
 
+    def test_contextual_logger_formats_args_lazily(self):
+        """Test that %-style args are kept on the record for lazy formatting."""
+        from web_search_mcp.utils.logging_config import ContextualLogger
+        
+        logger = ContextualLogger("test_lazy")
+        
+        with patch.object(logger._logger, 'handle') as mock_handle:
+            logger.info("Fetched %s in %d ms", "https://example.com", 12, context={"op": "fetch"})
+            
+            record = mock_handle.call_args[0][0]
+            assert record.msg == "Fetched %s in %d ms"
+            assert record.args == ("https://example.com", 12)
+            assert record.getMessage() == "Fetched https://example.com in 12 ms"
+            assert record.context == {"op": "fetch"}
+
+    def test_contextual_logger_skips_disabled_levels(self):
+        """Test no record is built for levels the logger has disabled."""
+        from web_search_mcp.utils.logging_config import ContextualLogger
+        
+        logger = ContextualLogger("test_disabled")
+        logger._logger.setLevel(logging.WARNING)
+        
+        try:
+            with patch.object(logger._logger, 'makeRecord') as mock_make_record, \
+                 patch.object(logger._logger, 'handle') as mock_handle:
+                logger.info("Skipped %s", "value", context={"op": "fetch"})
+                
+                mock_make_record.assert_not_called()
+                mock_handle.assert_not_called()
+        finally:
+            logger._logger.setLevel(logging.NOTSET)
+
     def test_performance_logging(self):
         """Test performance logging utilities."""
         from web_search_mcp.utils.logging_config import log_performance, PerformanceTimer
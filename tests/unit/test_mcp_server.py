@@ -9,7 +9,7 @@ from unittest.mock import Mock, patch
 
 import pytest
 
-from web_search_mcp.server import WebSearchMCPServer
+from web_search_mcp.server import WebSearchMCPServer, _server_lifespan
 
 
 class TestWebSearchMCPServer:
@@ -42,7 +42,17 @@ class TestWebSearchMCPServer:
             assert server.mcp == mock_mcp_instance
             
             # Verify FastMCP was called with correct name
-            mock_fastmcp.assert_called_once_with("test-web-search-mcp")
+            mock_fastmcp.assert_called_once_with("test-web-search-mcp", lifespan=_server_lifespan)
+
+    @pytest.mark.asyncio
+    async def test_lifespan_closes_shared_http_client(self):
+        """Test server shutdown closes the shared extraction client."""
+        with patch('web_search_mcp.server.close_default_client') as mock_close:
+            async with _server_lifespan(Mock()) as state:
+                assert state == {}
+                mock_close.assert_not_called()
+        
+        mock_close.assert_awaited_once()
 
     def test_server_initialization_custom_config_path(self):
         """Test server initialization with custom config path."""
@@ -86,7 +96,7 @@ class TestWebSearchMCPServer:
             server = WebSearchMCPServer()
             
             # Should use default name
-            mock_fastmcp.assert_called_once_with("web-search-mcp")
+            mock_fastmcp.assert_called_once_with("web-search-mcp", lifespan=_server_lifespan)
 
     def test_run_method(self):
         """Test the run method calls FastMCP.run()."""
@@ -13,13 +13,17 @@ from datetime import datetime, timezone
 from unittest.mock import AsyncMock, Mock, patch, MagicMock
 from typing import Dict, Any
 
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
 from src.web_search_mcp.transports.http_transport import (
     HTTPTransport,
     StreamableHTTPTransport,
     HTTPTransportConfig,
     HTTPTransportType,
     create_http_transport,
-    create_default_http_config
+    create_default_http_config,
+    _error_frame
 )
 
 from src.web_search_mcp.transports.sse_transport import (
@@ -28,7 +32,11 @@ from src.web_search_mcp.transports.sse_transport import (
     SSEMessage,
     SSEEvent,
     SSEConnection,
-    create_default_sse_config
+    create_default_sse_config,
+    _iso_now,
+    _keepalive_bytes,
+    _frame,
+    _CLOSE
 )
 
 from src.web_search_mcp.transports.transport_manager import (
@@ -91,7 +99,19 @@ class TestHTTPTransportConfig:
         assert restored_config.host == config.host
         assert restored_config.port == config.port
         assert restored_config.transport_type == config.transport_type
-    
+
+    def test_http_transport_config_to_dict_cache_invalidation(self):
+        """Test cached dictionary form tracks attribute changes."""
+        config = HTTPTransportConfig(port=8888)
+
+        assert not hasattr(config, "__dict__")
+        data = config.to_dict()
+        data["port"] = 1
+        assert config.to_dict()["port"] == 8888
+
+        config.port = 9999
+        assert config.to_dict()["port"] == 9999
+
     def test_create_default_http_config(self):
         """Test default HTTP configuration creation."""
         config = create_default_http_config()
@@ -138,7 +158,38 @@ class TestHTTPTransport:
         
         assert "test_method" in http_transport.message_handlers
         assert http_transport.message_handlers["test_method"] == test_handler
-    
+
+    def test_freeze_handlers(self, http_transport):
+        """Test frozen handler dispatch table."""
+        async def test_handler(request_data):
+            return {"result": "test"}
+
+        http_transport.register_handler("test_method", test_handler)
+        http_transport.freeze_handlers()
+
+        assert http_transport._get_handler("test_method") is test_handler
+        assert http_transport._get_handler("missing") is None
+        with pytest.raises(TypeError):
+            http_transport._handlers_frozen["other"] = test_handler
+
+        # Registration after freezing is still visible
+        http_transport.register_handler("late_method", test_handler)
+        assert http_transport._get_handler("late_method") is test_handler
+
+    @pytest.mark.asyncio
+    async def test_start_freezes_handlers(self, http_transport):
+        """Test starting the transport dispatches from the frozen table."""
+        async def test_handler(request_data):
+            return {"result": "test"}
+
+        http_transport.register_handler("test_method", test_handler)
+        with patch("src.web_search_mcp.transports.http_transport.uvicorn.Server") as server_cls:
+            server_cls.return_value.serve = AsyncMock()
+            await http_transport.start()
+
+        assert http_transport._handlers_frozen["test_method"] is test_handler
+        assert http_transport._get_handler == http_transport._handlers_frozen.get
+
     def test_get_endpoint_url(self, http_transport):
         """Test endpoint URL generation."""
         url = http_transport.get_endpoint_url()
@@ -148,7 +199,15 @@ class TestHTTPTransport:
     def test_is_running_false(self, http_transport):
         """Test is_running when server is not started."""
         assert http_transport.is_running() is False
-    
+
+    def test_is_running_started(self, http_transport):
+        """Test is_running follows the server's started flag."""
+        http_transport.server = Mock(spec=[])
+        assert http_transport.is_running() is False
+
+        http_transport.server = Mock(started=True)
+        assert http_transport.is_running() is True
+
     @pytest.mark.asyncio
     async def test_get_capabilities(self, http_transport):
         """Test capabilities endpoint."""
@@ -159,6 +218,106 @@ class TestHTTPTransport:
         assert "serverInfo" in capabilities
         assert capabilities["serverInfo"]["name"] == "web-search-mcp"
 
+        # Each call returns an independent copy
+        capabilities["serverInfo"]["name"] = "changed"
+        assert (await http_transport._get_capabilities())["serverInfo"]["name"] == "web-search-mcp"
+
+    def test_json_endpoints(self, http_transport):
+        """Test hand-serialized JSON endpoints."""
+        async def test_handler(request_data):
+            return {"result": request_data["params"]}
+
+        http_transport.register_handler("test_method", test_handler)
+        client = TestClient(http_transport.app)
+
+        health = client.get("/health")
+        assert health.headers["content-type"] == "application/json"
+        assert health.json()["status"] == "healthy"
+
+        capabilities = client.get("/mcp/capabilities")
+        assert capabilities.json()["serverInfo"]["name"] == "web-search-mcp"
+
+        response = client.post("/mcp", json={"method": "test_method", "params": [1, 2]})
+        assert response.status_code == 200
+        assert response.json() == {"result": [1, 2]}
+
+    def test_mcp_request_client_errors(self, http_transport):
+        """Test client errors keep their status instead of becoming 500s."""
+        http_transport.config.max_request_size = 64
+        client = TestClient(http_transport.app)
+
+        assert client.post("/mcp", content=b"{not json").status_code == 400
+        assert client.post("/mcp", json={"params": {}}).status_code == 400
+        assert client.post("/mcp", json={"method": "missing"}).status_code == 404
+        assert client.post("/mcp", content=b"x" * 128).status_code == 413
+
+    def test_mcp_request_handler_failure(self, http_transport):
+        """Test handler exceptions are reported as internal errors."""
+        async def failing_handler(request_data):
+            raise RuntimeError("boom")
+
+        http_transport.register_handler("fail", failing_handler)
+        client = TestClient(http_transport.app)
+
+        assert client.post("/mcp", json={"method": "fail"}).status_code == 500
+
+    def test_mcp_request_non_json_native_results(self, http_transport):
+        """Test results orjson cannot encode natively fall back to jsonable_encoder."""
+        from pydantic import BaseModel
+
+        class Item(BaseModel):
+            name: str
+
+        async def handler(request_data):
+            return {"item": Item(name="x"), "tags": {"a"}, 1: "one"}
+
+        http_transport.register_handler("rich", handler)
+        client = TestClient(http_transport.app)
+
+        response = client.post("/mcp", json={"method": "rich"})
+        assert response.status_code == 200
+        assert response.json() == {"item": {"name": "x"}, "tags": ["a"], "1": "one"}
+
+    def test_mcp_request_unserializable_result(self, http_transport):
+        """Test results that cannot be encoded become logged internal errors."""
+        async def handler(request_data):
+            return {"value": object()}
+
+        http_transport.register_handler("opaque", handler)
+        client = TestClient(http_transport.app)
+
+        with patch.object(http_transport.logger, "error") as log_error:
+            assert client.post("/mcp", json={"method": "opaque"}).status_code == 500
+        log_error.assert_called_once()
+
+    def test_health_timestamp_cached_per_second(self, http_transport):
+        """Test health timestamp is only reformatted when the second changes."""
+        with patch("src.web_search_mcp.transports.http_transport.time.time", return_value=1700000000.2):
+            first = http_transport._health_timestamp()
+        with patch("src.web_search_mcp.transports.http_transport.time.time", return_value=1700000000.9):
+            assert http_transport._health_timestamp() is first
+        with patch("src.web_search_mcp.transports.http_transport.time.time", return_value=1700000001.0):
+            second = http_transport._health_timestamp()
+
+        assert first == "2023-11-14T22:13:20+00:00"
+        assert second == "2023-11-14T22:13:21+00:00"
+
+    @pytest.mark.asyncio
+    async def test_read_body_rejects_oversized_request(self, http_transport):
+        """Test request body size limit is enforced while streaming."""
+        http_transport.config.max_request_size = 8
+
+        async def stream():
+            yield b'{"method":'
+            yield b'"never_read"}'
+
+        request = Mock()
+        request.stream = stream
+
+        with pytest.raises(HTTPException) as exc_info:
+            await http_transport._read_body(request)
+        assert exc_info.value.status_code == 413
+
 
 class TestStreamableHTTPTransport:
     """Test cases for streamable HTTP transport."""
@@ -207,6 +366,153 @@ class TestStreamableHTTPTransport:
         message = await queue.get()
         assert message["type"] == "update"
         assert message["data"] == test_data
+
+    @pytest.mark.asyncio
+    async def test_send_streaming_update_unknown_connection(self, streamable_transport):
+        """Test updates for closed connections are dropped."""
+        await streamable_transport.send_streaming_update("missing", {"message": "late"})
+
+        assert streamable_transport.streaming_connections == {}
+
+    @pytest.mark.asyncio
+    async def test_streaming_connection_ids_unique(self, streamable_transport):
+        """Test streaming connection IDs share a prefix and never repeat."""
+        def make_request():
+            async def stream():
+                yield b'{"method": "unknown"}'
+
+            request = Mock()
+            request.stream = stream
+            return request
+
+        first = await streamable_transport._handle_streaming_request(make_request())
+        second = await streamable_transport._handle_streaming_request(make_request())
+
+        assert first["connection_id"] != second["connection_id"]
+        assert first["connection_id"].startswith(streamable_transport._conn_prefix)
+        assert second["connection_id"].startswith(streamable_transport._conn_prefix)
+        assert first["stream_url"] == f"/mcp/stream/{first['connection_id']}"
+
+    @pytest.mark.asyncio
+    async def test_get_stream_is_event_stream(self, streamable_transport):
+        """Test stream responses are served as server-sent events."""
+        streamable_transport.streaming_connections["test_id"] = asyncio.Queue()
+
+        response = await streamable_transport._get_stream("test_id")
+
+        assert response.media_type == "text/event-stream"
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.headers["cache-control"] == "no-cache"
+
+    @pytest.mark.asyncio
+    async def test_get_stream_yields_sse_bytes(self, streamable_transport):
+        """Test stream frames are emitted as SSE-formatted bytes."""
+        queue = asyncio.Queue()
+        streamable_transport.streaming_connections["test_id"] = queue
+        await queue.put({"type": "response", "data": {"result": "ok"}})
+        await queue.put(None)
+
+        response = await streamable_transport._get_stream("test_id")
+        frames = [frame async for frame in response.body_iterator]
+
+        assert len(frames) == 1
+        assert isinstance(frames[0], bytes)
+        assert frames[0].startswith(b"data: ")
+        assert frames[0].endswith(b"\n\n")
+        assert json.loads(frames[0][6:]) == {"type": "response", "data": {"result": "ok"}}
+        assert "test_id" not in streamable_transport.streaming_connections
+
+    @pytest.mark.asyncio
+    async def test_get_stream_keepalive(self, streamable_transport):
+        """Test idle streams emit keepalive frames."""
+        queue = asyncio.Queue()
+        streamable_transport.streaming_connections["test_id"] = queue
+
+        response = await streamable_transport._get_stream("test_id")
+        with patch(
+            "src.web_search_mcp.transports.http_transport._queue_get",
+            side_effect=[asyncio.TimeoutError(), None],
+        ):
+            frames = [frame async for frame in response.body_iterator]
+
+        assert frames == [b'data: {"type":"keepalive"}\n\n']
+
+    def test_error_frame_cached(self):
+        """Test error frames are serialized once per message."""
+        frame = _error_frame("stream failed")
+
+        assert frame == b'data: {"type":"error","message":"stream failed"}\n\n'
+        assert _error_frame("stream failed") is frame
+
+    def test_direct_streaming_request(self, streamable_transport):
+        """Test direct streaming returns the stream from the POST itself."""
+        async def handler(request_data):
+            yield {"chunk": 1}
+            yield {"chunk": 2}
+
+        streamable_transport.register_handler("test_method", handler)
+        client = TestClient(streamable_transport.app)
+
+        response = client.post("/mcp/stream/direct", json={"method": "test_method"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        frames = [json.loads(line[6:]) for line in response.text.split("\n\n") if line]
+        assert frames == [
+            {"type": "update", "data": {"chunk": 1}},
+            {"type": "update", "data": {"chunk": 2}},
+        ]
+        assert streamable_transport.streaming_connections == {}
+
+    @pytest.mark.asyncio
+    async def test_stream_cancels_producer_on_disconnect(self, streamable_transport):
+        """Test closing the stream early cancels the task filling its queue."""
+        queue = asyncio.Queue()
+
+        async def produce():
+            while True:
+                await queue.put({"chunk": 1})
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(produce())
+        response = streamable_transport._stream_response(queue, task=task)
+
+        body = response.body_iterator
+        assert await body.__anext__() == b'data: {"chunk":1}\n\n'
+        await body.aclose()
+        await asyncio.sleep(0)
+
+        assert task.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_process_streaming_request_coroutine(self, streamable_transport):
+        """Test coroutine handlers produce a single response."""
+        async def handler(request_data):
+            return {"result": "done"}
+
+        streamable_transport.register_handler("test_method", handler)
+        queue = asyncio.Queue()
+
+        await streamable_transport._process_streaming_request({"method": "test_method"}, queue)
+
+        assert await queue.get() == {"type": "response", "data": {"result": "done"}}
+        assert await queue.get() is None
+
+    @pytest.mark.asyncio
+    async def test_process_streaming_request_async_generator(self, streamable_transport):
+        """Test async generator handlers stream one update per chunk."""
+        async def handler(request_data):
+            for i in range(3):
+                yield {"chunk": i}
+
+        streamable_transport.register_handler("test_method", handler)
+        queue = asyncio.Queue()
+
+        await streamable_transport._process_streaming_request({"method": "test_method"}, queue)
+
+        for i in range(3):
+            assert await queue.get() == {"type": "update", "data": {"chunk": i}}
+        assert await queue.get() is None
     
     def test_create_http_transport_streamable(self, streamable_config):
         """Test HTTP transport factory with streamable type."""
@@ -274,6 +580,93 @@ class TestSSEMessage:
         assert "data: line2" in formatted
         assert "data: line3" in formatted
 
+    def test_sse_message_format_terminates_event(self):
+        """Test single and multiline messages both end with a blank line."""
+        single = SSEMessage(data="hello", event="message", id="1")
+        multi = SSEMessage(data="line1\nline2", event="message", id="2")
+
+        assert single.format() == "id: 1\nevent: message\ndata: hello\n\n"
+        assert multi.format() == "id: 2\nevent: message\ndata: line1\ndata: line2\n\n"
+
+    def test_sse_message_bytes_data(self):
+        """Test pre-serialized bytes payloads format like their str form."""
+        message = SSEMessage(data=b'{"type":"test"}', event="message", id="1")
+        expected = 'id: 1\nevent: message\ndata: {"type":"test"}\n\n'
+
+        assert message.formatted_bytes == expected.encode()
+        assert message.format() == expected
+
+    def test_sse_message_formatted_bytes_multiline(self):
+        """Test multiline payloads are framed as bytes without a str round trip."""
+        for data in ("héllo\nwörld", "héllo\nwörld".encode()):
+            message = SSEMessage(data=data, event="message", id="3")
+            
+            assert message.formatted_bytes == (
+                "id: 3\nevent: message\ndata: héllo\ndata: wörld\n\n".encode()
+            )
+            assert message.formatted_bytes == message.format().encode()
+
+    def test_frame_matches_sse_message(self):
+        """Test direct framing matches the SSEMessage formatting."""
+        data = b'{"type":"test"}'
+
+        assert _frame(data, "message", 7) == SSEMessage(
+            data=data, event="message", id="7"
+        ).formatted_bytes
+        assert _frame(data, "keepalive") == SSEMessage(
+            data=data, event="keepalive"
+        ).formatted_bytes
+
+    def test_sse_message_format_into(self):
+        """Test messages append their encoded form to a send buffer."""
+        buf = bytearray(b"event: a\ndata: 1\n\n")
+        message = SSEMessage(data="2", event="b")
+
+        message.format_into(buf)
+
+        assert bytes(buf) == b"event: a\ndata: 1\n\nevent: b\ndata: 2\n\n"
+
+    def test_sse_message_formatted_once(self):
+        """Test formatting is cached for messages shared across connections."""
+        message = SSEMessage(data='{"type": "test"}', event="message", id="1")
+
+        assert message.format() is message.format()
+        assert message.formatted_bytes is message.formatted_bytes
+        assert message.formatted_bytes == message.format().encode()
+        assert message == SSEMessage(data='{"type": "test"}', event="message", id="1")
+
+
+class TestISOTimestamp:
+    """Test cases for the cached SSE timestamp."""
+
+    def test_iso_now_cached_per_second(self):
+        """Test timestamps are only reformatted when the second changes."""
+        target = "src.web_search_mcp.transports.sse_transport.time.time"
+        with patch(target, return_value=1700000000.1):
+            first = _iso_now()
+        with patch(target, return_value=1700000000.8):
+            assert _iso_now() is first
+        with patch(target, return_value=1700000001.0):
+            second = _iso_now()
+
+        assert first == "2023-11-14T22:13:20+00:00"
+        assert second == "2023-11-14T22:13:21+00:00"
+
+    def test_keepalive_bytes_shared(self):
+        """Test keepalive frames are built once per second without an id."""
+        target = "src.web_search_mcp.transports.sse_transport.time.time"
+        with patch(target, return_value=1700000100.1):
+            first = _keepalive_bytes()
+        with patch(target, return_value=1700000100.9):
+            assert _keepalive_bytes() is first
+
+        assert first.startswith(b"event: keepalive\ndata: ")
+        assert b"id: " not in first
+        assert json.loads(first.split(b"data: ", 1)[1]) == {
+            "type": "keepalive",
+            "timestamp": "2023-11-14T22:15:00+00:00"
+        }
+
 
 class TestSSEEvent:
     """Test cases for SSE event types."""
@@ -326,6 +719,7 @@ class TestSSETransportConfig:
         assert data["host"] == "sse.local"
         assert data["port"] == 9999
         assert data["keepalive_interval"] == 45.0
+        assert data["queue_maxsize"] == 1024
         
         # Test deserialization
         restored_config = SSETransportConfig.from_dict(data)
@@ -359,6 +753,7 @@ class TestSSEConnection:
         assert sse_connection.client_info["user_agent"] == "test"
         assert sse_connection.is_active is True
         assert isinstance(sse_connection.message_queue, asyncio.Queue)
+        assert isinstance(sse_connection.created_at, float)
     
     @pytest.mark.asyncio
     async def test_send_message(self, sse_connection):
@@ -369,8 +764,24 @@ class TestSSEConnection:
         
         assert not sse_connection.message_queue.empty()
         queued_message = await sse_connection.message_queue.get()
-        assert queued_message == message
+        assert queued_message == message.formatted_bytes
     
+    @pytest.mark.asyncio
+    async def test_send_message_drops_when_queue_full(self):
+        """Test a full queue drops messages instead of blocking the sender."""
+        connection = SSEConnection("test_connection", {}, queue_maxsize=2)
+
+        assert await connection.send_message(SSEMessage(data="1")) is True
+        assert await connection.send_message(SSEMessage(data="2")) is True
+        assert await connection.send_message(SSEMessage(data="3")) is False
+
+        assert connection.message_queue.qsize() == 2
+        assert connection.dropped_messages == 1
+
+        # Closing still gets through to a stalled client
+        await connection.close()
+        assert connection.message_queue.qsize() == 2
+
     @pytest.mark.asyncio
     async def test_close_connection(self, sse_connection):
         """Test closing connection."""
@@ -380,7 +791,7 @@ class TestSSEConnection:
         assert not sse_connection.message_queue.empty()
         
         close_message = await sse_connection.message_queue.get()
-        assert close_message.event == SSEEvent.CLOSE
+        assert close_message is _CLOSE
     
     def test_is_expired(self, sse_connection):
         """Test connection expiration check."""
@@ -391,6 +802,22 @@ class TestSSEConnection:
         sse_connection.is_active = False
         assert sse_connection.is_expired(300.0) is True
 
+    def test_is_expired_after_inactivity(self, sse_connection):
+        """Test connection expires once idle for longer than the timeout."""
+        sse_connection.last_activity -= 301.0
+
+        assert sse_connection.is_expired(300.0) is True
+        assert sse_connection.is_expired(600.0) is False
+
+    @pytest.mark.asyncio
+    async def test_send_message_refreshes_activity(self, sse_connection):
+        """Test sending a message resets the idle timer."""
+        sse_connection.last_activity -= 301.0
+
+        await sse_connection.send_message(SSEMessage(data="test message"))
+
+        assert sse_connection.is_expired(300.0) is False
+
 
 class TestSSETransport:
     """Test cases for SSE transport."""
@@ -451,11 +878,11 @@ class TestSSETransport:
         # Add mock connections
         connection1 = Mock()
         connection1.is_active = True
-        connection1.send_message = AsyncMock()
+        connection1.send_bytes = Mock()
         
         connection2 = Mock()
         connection2.is_active = True
-        connection2.send_message = AsyncMock()
+        connection2.send_bytes = Mock()
         
         sse_transport.connections["conn1"] = connection1
         sse_transport.connections["conn2"] = connection2
@@ -464,9 +891,170 @@ class TestSSETransport:
         await sse_transport.broadcast_message(test_data)
         
         # Verify both connections received the message
-        connection1.send_message.assert_called_once()
-        connection2.send_message.assert_called_once()
+        connection1.send_bytes.assert_called_once()
+        connection2.send_bytes.assert_called_once()
     
+    @pytest.mark.asyncio
+    async def test_broadcast_raw_frames_payload_as_is(self, sse_transport):
+        """Test pre-serialized broadcasts are framed without re-encoding."""
+        connection = SSEConnection("test_id", {})
+        sse_transport.connections["test_id"] = connection
+        
+        await sse_transport.broadcast_raw(b'{"n":1}', "update")
+        
+        frame = await connection.message_queue.get()
+        assert frame.endswith(b'\nevent: update\ndata: {"n":1}\n\n')
+    
+    @pytest.fixture
+    def sse_request(self):
+        """Mock SSE client request fixture."""
+        request = Mock()
+        request.headers = {"user-agent": "test"}
+        request.client = Mock(host="127.0.0.1")
+        request.query_params = {}
+        return request
+
+    @pytest.mark.asyncio
+    async def test_sse_stream_batches_pending_messages(self, sse_transport, sse_request):
+        """Test messages queued together are streamed as a single chunk."""
+        response = await sse_transport._handle_sse_connection(sse_request)
+        connection = next(iter(sse_transport.connections.values()))
+
+        for i in range(3):
+            await connection.send_message(SSEMessage(data=f"message {i}", event="message"))
+        await connection.close()
+
+        chunks = [chunk async for chunk in response.body_iterator]
+
+        assert len(chunks) == 2
+        assert b"connected" in chunks[0]
+        assert chunks[1] == (
+            b"event: message\ndata: message 0\n\n"
+            b"event: message\ndata: message 1\n\n"
+            b"event: message\ndata: message 2\n\n"
+        )
+        assert sse_transport.connections == {}
+
+    @pytest.mark.asyncio
+    async def test_sse_connection_rejected_at_capacity(self, sse_transport, sse_request):
+        """Test new streams are refused once max_connections is reached."""
+        sse_transport.config.max_connections = 1
+        sse_transport.connections["existing"] = SSEConnection("existing", {})
+        
+        with pytest.raises(HTTPException) as exc_info:
+            await sse_transport._handle_sse_connection(sse_request)
+        
+        assert exc_info.value.status_code == 503
+        assert list(sse_transport.connections) == ["existing"]
+
+    @pytest.mark.asyncio
+    async def test_sse_stream_relays_queued_keepalives(self, sse_transport, sse_request):
+        """Test keepalives from the shared loop reach idle streams via the queue."""
+        response = await sse_transport._handle_sse_connection(sse_request)
+        stream = response.body_iterator
+        
+        assert response.headers["cache-control"] == "no-cache"
+        assert response.headers["x-accel-buffering"] == "no"
+        initial = await stream.__anext__()
+        assert initial.startswith(b"id: ")
+        assert b"\nevent: message\ndata: " in initial
+        assert initial.endswith(b"}\n\n")
+        connected = json.loads(initial.split(b"data: ", 1)[1])
+        assert connected["type"] == "connected"
+        assert connected["connection_id"] in sse_transport.connections
+        assert connected["timestamp"] == _iso_now()
+        
+        sse_transport._fan_out(_keepalive_bytes())
+        assert await stream.__anext__() == _keepalive_bytes()
+        
+        await stream.aclose()
+        assert sse_transport.connections == {}
+
+    @pytest.mark.asyncio
+    async def test_expire_connections_uses_deadline_heap(self, sse_transport, sse_request):
+        """Test due connections are closed and recently active ones rescheduled."""
+        sse_transport.config.connection_timeout = 0.0
+        await sse_transport._handle_sse_connection(sse_request)
+        await sse_transport._handle_sse_connection(sse_request)
+        stale_id, active_id = list(sse_transport.connections)
+        active = sse_transport.connections[active_id]
+        active.last_activity += 100.0
+        
+        expired = await sse_transport._expire_connections()
+        
+        assert expired == 1
+        assert list(sse_transport.connections) == [active_id]
+        assert sse_transport._expiry_heap == [(active.last_activity, active_id)]
+
+    @pytest.mark.asyncio
+    async def test_list_connections(self, sse_transport):
+        """Test connection listing reports ISO timestamps."""
+        sse_transport.connections["test_id"] = SSEConnection("test_id", {"user_agent": "test"})
+
+        listing = await sse_transport._list_connections()
+
+        assert listing["total_connections"] == 1
+        info = listing["connections"][0]
+        assert info["connection_id"] == "test_id"
+        created = datetime.fromisoformat(info["created_at"])
+        last_activity = datetime.fromisoformat(info["last_activity"])
+        assert abs((last_activity - created).total_seconds()) < 5
+
+    @pytest.mark.asyncio
+    async def test_event_ids_sequential(self, sse_transport):
+        """Test event ids come from a per-transport counter."""
+        connection = SSEConnection("test_id", {})
+        sse_transport.connections["test_id"] = connection
+
+        await sse_transport.broadcast_message({"n": 1})
+        await sse_transport.send_to_connection("test_id", {"n": 2})
+
+        first = await connection.message_queue.get()
+        second = await connection.message_queue.get()
+        first_id = int(first.split(b"\n", 1)[0].removeprefix(b"id: "))
+        second_id = int(second.split(b"\n", 1)[0].removeprefix(b"id: "))
+        assert second_id == first_id + 1
+
+    @pytest.mark.asyncio
+    async def test_broadcast_isolates_failures(self, sse_transport):
+        """Test one failing connection doesn't stop delivery to the rest."""
+        failing = Mock()
+        failing.is_active = True
+        failing.send_bytes = Mock(side_effect=RuntimeError("broken pipe"))
+
+        healthy = Mock()
+        healthy.is_active = True
+        healthy.send_bytes = Mock()
+
+        sse_transport.connections["failing"] = failing
+        sse_transport.connections["healthy"] = healthy
+
+        await sse_transport.broadcast_message({"message": "broadcast test"})
+
+        healthy.send_bytes.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_broadcast_tolerates_disconnects(self, sse_transport):
+        """Test connections closing mid-broadcast don't break iteration."""
+        connection2 = Mock()
+        connection2.is_active = True
+        connection2.send_bytes = Mock()
+
+        def disconnect_other(payload):
+            sse_transport.connections.pop("conn2", None)
+
+        connection1 = Mock()
+        connection1.is_active = True
+        connection1.send_bytes = Mock(side_effect=disconnect_other)
+
+        sse_transport.connections["conn1"] = connection1
+        sse_transport.connections["conn2"] = connection2
+
+        await sse_transport.broadcast_message({"message": "broadcast test"})
+
+        connection1.send_bytes.assert_called_once()
+        assert list(sse_transport.connections) == ["conn1"]
+
     @pytest.mark.asyncio
     async def test_send_to_connection(self, sse_transport):
         """Test sending message to specific connection."""
@@ -479,10 +1067,44 @@ class TestSSETransport:
         
         connection.send_message.assert_called_once()
     
+    @pytest.mark.asyncio
+    async def test_send_endpoint_skips_unknown_targets(self, sse_transport):
+        """Test /send delivers only to known target connections."""
+        connection1 = Mock()
+        connection1.send_message = AsyncMock(return_value=True)
+        connection2 = Mock()
+        connection2.send_message = AsyncMock(return_value=True)
+        sse_transport.connections["conn1"] = connection1
+        sse_transport.connections["conn2"] = connection2
+        
+        request = Mock()
+        request.body = AsyncMock(return_value=json.dumps({
+            "message": {"text": "hi"},
+            "connections": ["conn2", "missing"]
+        }).encode())
+        
+        result = await sse_transport._handle_send_message(request)
+        
+        assert result["sent_count"] == 1
+        connection1.send_message.assert_not_called()
+        connection2.send_message.assert_called_once()
+    
     def test_is_running_false(self, sse_transport):
         """Test is_running when server is not started."""
         assert sse_transport.is_running() is False
 
+    @pytest.mark.asyncio
+    async def test_start_lets_uvicorn_pick_event_loop(self, sse_transport):
+        """Test the server config selects uvloop when available."""
+        with patch("src.web_search_mcp.transports.sse_transport.uvicorn.Server") as server_cls:
+            server_cls.return_value.serve = AsyncMock()
+            await sse_transport.start()
+        
+        sse_transport.keepalive_task.cancel()
+        sse_transport.cleanup_task.cancel()
+        config = server_cls.call_args.args[0]
+        assert config.loop == "auto"
+
 
 class TestTransportManagerConfig:
     """Test cases for transport manager configuration."""
@@ -522,6 +1144,49 @@ class TestTransportManagerConfig:
         assert restored_config.enabled_transports == [TransportType.HTTP]
         assert restored_config.http_config is not None
         assert restored_config.sse_config is None
+    
+    def test_transport_manager_config_from_dict_values(self):
+        """Test transport values map to members and unknown values are rejected."""
+        config = TransportManagerConfig.from_dict({"enabled_transports": ["sse", "http"]})
+        
+        assert config.enabled_transports == [TransportType.SSE, TransportType.HTTP]
+        assert TransportManagerConfig.from_dict({}).enabled_transports == [TransportType.HTTP]
+        with pytest.raises(ValueError):
+            TransportManagerConfig.from_dict({"enabled_transports": ["carrier-pigeon"]})
+    
+    def test_transport_manager_config_enabled_views(self):
+        """Test derived enabled views follow enabled_transports assignments."""
+        config = TransportManagerConfig(enabled_transports=[TransportType.BOTH])
+        
+        assert config.enabled_set == {TransportType.BOTH, TransportType.HTTP, TransportType.SSE}
+        assert config.to_dict()["enabled_transports"] == ["both"]
+        
+        config.enabled_transports = [TransportType.SSE]
+        
+        assert config.enabled_set == {TransportType.SSE}
+        assert config.to_dict()["enabled_transports"] == ["sse"]
+    
+    def test_transport_manager_config_enabled_views_follow_mutation(self):
+        """Test derived enabled views reflect in-place list changes."""
+        config = TransportManagerConfig(enabled_transports=[TransportType.HTTP])
+        
+        config.enabled_transports.append(TransportType.SSE)
+        
+        assert config.enabled_set == {TransportType.HTTP, TransportType.SSE}
+        assert config.to_dict()["enabled_transports"] == ["http", "sse"]
+        
+        config.enabled_transports.remove(TransportType.HTTP)
+        
+        assert config.enabled_set == {TransportType.SSE}
+        assert config.to_dict()["enabled_transports"] == ["sse"]
+    
+    def test_transport_manager_config_accepts_iterables(self):
+        """Test a one-shot iterable of transports is materialized once."""
+        config = TransportManagerConfig(enabled_transports=(t for t in [TransportType.HTTP]))
+        
+        assert config.enabled_transports == [TransportType.HTTP]
+        assert config.to_dict()["enabled_transports"] == ["http"]
+        assert config.enabled_set == {TransportType.HTTP}
 
 
 class TestTransportManager:
@@ -568,6 +1233,9 @@ class TestTransportManager:
         assert "transports" in status
         assert "http" in status["transports"]
         assert status["transports"]["http"]["running"] is False
+        assert status["transports"]["http"]["endpoint"] == "http://localhost:8080/mcp"
+        assert status["transports"]["http"]["type"] == "streamable"
+        assert status["transports"]["http"]["active_streams"] == 0
     
     def test_get_endpoints(self, transport_manager):
         """Test getting transport endpoints."""
@@ -575,18 +1243,81 @@ class TestTransportManager:
         
         assert "http" in endpoints
         assert endpoints["http"] == "http://localhost:8080/mcp"
+        
+        endpoints["http"] = "changed"
+        assert transport_manager.get_endpoints()["http"] == "http://localhost:8080/mcp"
     
     def test_get_transport(self, transport_manager):
         """Test getting specific transport."""
         http_transport = transport_manager.get_transport(TransportType.HTTP)
         sse_transport = transport_manager.get_transport(TransportType.SSE)
         
-        assert http_transport is not None
+        assert http_transport is transport_manager.http_transport
         assert sse_transport is None
+        assert transport_manager.get_transport(TransportType.BOTH) is None
+        assert transport_manager._transports_by_type is transport_manager._transports_by_type
     
     def test_is_running_false(self, transport_manager):
         """Test is_running when no transports are running."""
         assert transport_manager.is_running() is False
+    
+    def test_capabilities_probed_once(self, transport_manager):
+        """Test transport capabilities are resolved at construction."""
+        traditional = TransportManager(TransportManagerConfig(
+            enabled_transports=[TransportType.HTTP],
+            http_config=HTTPTransportConfig(transport_type=HTTPTransportType.TRADITIONAL)
+        ))
+        empty = TransportManager(TransportManagerConfig(enabled_transports=[]))
+        
+        assert transport_manager._http_can_stream is True
+        assert transport_manager._http_has_streams is True
+        assert traditional._http_can_stream is False
+        assert traditional.get_status()["transports"]["http"].get("active_streams") is None
+        assert empty._any_transport is False
+        assert empty.is_running() is False
+    
+    def test_both_enables_http_and_sse(self):
+        """Test TransportType.BOTH initializes every configured transport."""
+        manager = TransportManager(TransportManagerConfig(
+            enabled_transports=[TransportType.BOTH],
+            http_config=HTTPTransportConfig(),
+            sse_config=SSETransportConfig()
+        ))
+        
+        assert manager.http_transport is not None
+        assert manager.sse_transport is not None
+    
+    @pytest.mark.asyncio
+    async def test_single_transport_skips_gather(self, transport_manager):
+        """Test a lone transport is awaited directly with failures isolated."""
+        failing_start = AsyncMock(side_effect=RuntimeError("bind failed"))
+        
+        with patch.object(transport_manager.http_transport, 'start', failing_start), \
+             patch("src.web_search_mcp.transports.transport_manager.asyncio.gather") as mock_gather:
+            await transport_manager.start()
+        
+        failing_start.assert_awaited_once()
+        mock_gather.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_gathered_failures_are_logged(self):
+        """Test a failing transport is logged when several run together."""
+        manager = TransportManager(TransportManagerConfig(
+            enabled_transports=[TransportType.BOTH],
+            http_config=HTTPTransportConfig(),
+            sse_config=SSETransportConfig()
+        ))
+        failing_start = AsyncMock(side_effect=RuntimeError("bind failed"))
+        healthy_start = AsyncMock()
+        
+        with patch.object(manager.http_transport, 'start', failing_start), \
+             patch.object(manager.sse_transport, 'start', healthy_start), \
+             patch.object(manager.logger, 'error') as mock_error:
+            await manager.start()
+        
+        failing_start.assert_awaited_once()
+        healthy_start.assert_awaited_once()
+        mock_error.assert_called_once_with("Transport operation failed: bind failed")
 
 
 class TestTransportFactories:
@@ -614,6 +1345,8 @@ class TestTransportFactories:
         """Test creating transport with invalid type."""
         with pytest.raises(ValueError):
             create_transport("invalid_type", {})
+        with pytest.raises(ValueError):
+            create_transport(TransportType.BOTH, {})
     
     def test_get_available_transports(self):
         """Test getting available transport types."""
@@ -643,6 +1376,10 @@ class TestTransportFactories:
         assert manager.sse_transport is not None
         assert manager.http_transport.config.port == 9000
         assert manager.sse_transport.config.port == 9001
+        assert manager.get_endpoints() == {
+            "http": "http://localhost:9000/mcp",
+            "sse": "http://localhost:9001/events"
+        }
 
 
 class TestTransportIntegration:
@@ -708,10 +1445,28 @@ class TestTransportIntegration:
         manager = create_dual_transport_manager()
         
         # Mock the broadcast methods
-        with patch.object(manager.sse_transport, 'broadcast_message') as mock_sse_broadcast, \
+        with patch.object(manager.sse_transport, 'broadcast_raw') as mock_sse_broadcast, \
              patch.object(manager.sse_transport, 'is_running', return_value=True):
             
             test_data = {"type": "notification", "message": "test broadcast"}
             await manager.broadcast_message(test_data)
             
-            mock_sse_broadcast.assert_called_once_with(test_data, "message") 
\ No newline at end of file
+            mock_sse_broadcast.assert_called_once_with(
+                b'{"type":"notification","message":"test broadcast"}', "message"
+            )     
+    @pytest.mark.asyncio
+    async def test_send_to_connection_across_transports(self):
+        """Test a failing transport does not stop delivery on the other."""
+        manager = create_dual_transport_manager()
+        
+        with patch.object(
+            manager.sse_transport, 'send_to_connection', AsyncMock(side_effect=RuntimeError("boom"))
+        ) as mock_sse_send, \
+             patch.object(manager.sse_transport, 'is_running', return_value=True), \
+             patch.object(manager.http_transport, 'send_streaming_update', AsyncMock()) as mock_http_send:
+            
+            test_data = {"type": "notification"}
+            await manager.send_to_connection("conn1", test_data)
+            
+            mock_sse_send.assert_awaited_once_with("conn1", test_data)
+            mock_http_send.assert_awaited_once_with("conn1", test_data)